@@ -0,0 +1,202 @@
+import os
+import json
+import random
+from pathlib import Path
+from Classes.Utils.SteamLib import GameLibrary
+
+
+
+WORDS = [
+    "Dark", "Souls", "Hollow", "Knight", "Star", "Dew", "Valley", "Portal", "Half", "Life", "Counter", "Strike",
+    "Stardust", "Dungeon", "Legends", "Tactics", "Frontier", "Empire", "Chronicles", "Rogue", "Survivor",
+    "Kingdom", "Raiders", "Galaxy", "Ancient", "Shadow", "Pixel", "Quest", "Odyssey", "Factory", "Island",
+    "Crimson", "Mystery", "Tower", "Defense", "Racing", "Drift", "Horizon", "Echo", "Garden", "Simulator",
+    "Élan", "Café", "Mañana", "Zürich", "Fjörd", "Ōkami", "Noël", "Señor",
+]
+SUFFIXES = ["", "", "", " 2", " 3", " II", ": Remastered", " - Definitive Edition", " Online", ": Director's Cut"]
+REDISTRIBUTABLES = "228980"  # Steamworks Common Redistributables, skipped by get_installed_games
+
+
+
+def game_name(rng, used):
+    """Makes a unique, plausible title."""
+    while True:
+        name = " ".join(rng.sample(WORDS, rng.randint(1, 3))) + rng.choice(SUFFIXES)
+        if name not in used:
+            used.add(name)
+            return name
+
+
+def library_folders_vdf(libraries):
+    """Renders libraryfolders.vdf for {library path: [app ids]}."""
+    lines = ['"libraryfolders"', '{']
+    for index, (path, app_ids) in enumerate(libraries.items()):
+        lines += [
+            f'\t"{index}"', '\t{',
+            f'\t\t"path"\t\t"{path}"',
+            '\t\t"label"\t\t""',
+            f'\t\t"contentid"\t\t"{7000000000000000000 + index}"',
+            '\t\t"totalsize"\t\t"0"',
+            '\t\t"apps"', '\t\t{',
+        ]
+        lines += [f'\t\t\t"{app_id}"\t\t"0"' for app_id in app_ids]
+        lines += ['\t\t}', '\t}']
+    lines.append('}')
+    return "\n".join(lines) + "\n"
+
+
+def app_manifest(app_id, name, last_played, last_updated, size_on_disk):
+    """Renders an appmanifest_<appid>.acf with the fields Steam writes, not just the ones we read."""
+    return (
+        '"AppState"\n{\n'
+        f'\t"appid"\t\t"{app_id}"\n'
+        '\t"universe"\t\t"1"\n'
+        '\t"LauncherPath"\t\t"C:\\\\Program Files (x86)\\\\Steam\\\\steam.exe"\n'
+        f'\t"name"\t\t"{name}"\n'
+        '\t"StateFlags"\t\t"4"\n'
+        f'\t"installdir"\t\t"{name}"\n'
+        f'\t"LastUpdated"\t\t"{last_updated}"\n'
+        f'\t"LastPlayed"\t\t"{last_played}"\n'
+        f'\t"SizeOnDisk"\t\t"{size_on_disk}"\n'
+        '\t"StagingSize"\t\t"0"\n'
+        f'\t"buildid"\t\t"{app_id * 7 % 10000000}"\n'
+        '\t"LastOwner"\t\t"76561198000000000"\n'
+        '\t"BytesToDownload"\t\t"0"\n'
+        '\t"BytesDownloaded"\t\t"0"\n'
+        '\t"AutoUpdateBehavior"\t\t"0"\n'
+        '\t"AllowOtherDownloadsWhileRunning"\t\t"0"\n'
+        '\t"ScheduledAutoUpdate"\t\t"0"\n'
+        '\t"InstalledDepots"\n\t{\n'
+        f'\t\t"{app_id + 1}"\n\t\t{{\n'
+        f'\t\t\t"manifest"\t\t"{app_id * 7919}"\n'
+        f'\t\t\t"size"\t\t"{size_on_disk}"\n'
+        '\t\t}\n\t}\n'
+        '\t"UserConfig"\n\t{\n\t\t"language"\t\t"english"\n\t}\n'
+        '\t"MountedConfig"\n\t{\n\t\t"language"\t\t"english"\n\t}\n'
+        '}\n'
+    )
+
+
+def generate_library(root, game_count, libraries=3, installed_ratio=0.3, unowned_installed_ratio=0.02,
+                     excluded_ratio=0.05, covers=False, seed=0):
+    """Fabricates a Steam install, owned-games response, exclusion file and app config under root.
+
+    Layout:
+        root/steam/steamapps/libraryfolders.vdf and the first library's manifests
+        root/library_<n>/steamapps/appmanifest_<appid>.acf for the other libraries
+        root/owned_games.json         GetOwnedGames response
+        root/exclusions.json          {name: appid} for excluded_ratio of the games
+        root/app/config.json          config pointing at the fake install
+        root/app/Cache/Games/         cached covers when covers is set
+
+    Returns a dict of the paths and counts.
+    """
+    rng = random.Random(seed)
+    root = Path(root)
+    steam_path = root / "steam"
+    library_paths = [steam_path] + [root / f"library_{index}" for index in range(1, libraries)]
+    for path in library_paths:
+        (path / "steamapps").mkdir(parents=True, exist_ok=True)
+
+    now = 1_700_000_000
+    used_names, owned, installed = set(), [], {path: [] for path in library_paths}
+    for index in range(game_count):
+        app_id = 10 * (index + 1)
+        name = game_name(rng, used_names)
+        played = rng.random() < 0.7
+        game = {
+            "appid": app_id,
+            "name": name,
+            "playtime_forever": int(rng.paretovariate(1.2) * 30) if played else 0,
+            "rtime_last_played": now - rng.randint(0, 5 * 365 * 86400) if played else 0,
+            "img_icon_url": f"{app_id:040x}",
+            "has_community_visible_stats": rng.random() < 0.5,
+        }
+
+        is_installed = rng.random() < installed_ratio
+        owns = not is_installed or rng.random() >= unowned_installed_ratio
+        if owns:
+            owned.append(game)
+        if is_installed:
+            library = rng.choice(library_paths)
+            size = int(rng.lognormvariate(22, 1.5))
+            installed[library].append((app_id, name, game["rtime_last_played"], now - rng.randint(0, 365 * 86400), size))
+
+    installed[steam_path].append((int(REDISTRIBUTABLES), "Steamworks Common Redistributables", 0, now, 0))
+    for library, games in installed.items():
+        steamapps = library / "steamapps"
+        for app_id, name, last_played, last_updated, size in games:
+            with open(steamapps / f"appmanifest_{app_id}.acf", "w", encoding="utf-8") as file:
+                file.write(app_manifest(app_id, name, last_played, last_updated, size))
+
+    with open(steam_path / "steamapps" / "libraryfolders.vdf", "w", encoding="utf-8") as file:
+        file.write(library_folders_vdf({str(path): [game[0] for game in games] for path, games in installed.items()}))
+
+    with open(root / "owned_games.json", "w", encoding="utf-8") as file:
+        json.dump({"response": {"game_count": len(owned), "games": owned}}, file)
+
+    excluded = rng.sample(owned, int(len(owned) * excluded_ratio))
+    with open(root / "exclusions.json", "w", encoding="utf-8") as file:
+        json.dump({game["name"]: str(game["appid"]) for game in excluded}, file, indent=4)
+
+    app_root = root / "app"
+    (app_root / "Cache" / "Games").mkdir(parents=True, exist_ok=True)
+    with open(app_root / "config.json", "w") as file:
+        json.dump({"1": {
+            "steam_path": str(steam_path),
+            "api_key": "0" * 32,
+            "profile_id": "76561198000000000",
+            "exclusion_file": str(root / "exclusions.json"),
+        }}, file, indent=4)
+
+    cover_count = write_covers(app_root / "Cache" / "Games", [game["appid"] for game in owned]) if covers else 0
+    return {
+        "root": str(root),
+        "steam_path": str(steam_path),
+        "app_root": str(app_root),
+        "owned_games_file": str(root / "owned_games.json"),
+        "exclusion_file": str(root / "exclusions.json"),
+        "games": game_count,
+        "owned": len(owned),
+        "installed": sum(len(games) for games in installed.values()) - 1,
+        "excluded": len(excluded),
+        "covers": cover_count,
+    }
+
+
+def write_covers(cover_dir, app_ids):
+    """Writes an 80x120 JPEG per app id, the size the loader caches. Needs PyQt5; returns how many were written."""
+    try:
+        from PyQt5.QtCore import QBuffer, QIODevice
+        from PyQt5.QtGui import QImage, QColor
+    except ImportError:
+        print("PyQt5 is not available, skipping covers")
+        return 0
+
+    # Encode a handful of distinct images once and reuse their bytes
+    templates = []
+    for hue in range(0, 360, 45):
+        image = QImage(80, 120, QImage.Format_RGB32)
+        image.fill(QColor.fromHsv(hue, 160, 200))
+        buffer = QBuffer()
+        buffer.open(QIODevice.WriteOnly)
+        image.save(buffer, "JPG")
+        templates.append(bytes(buffer.data()))
+
+    for app_id in app_ids:
+        with open(os.path.join(cover_dir, f"game_{app_id}.jpg"), "wb") as file:
+            file.write(templates[app_id % len(templates)])
+    return len(app_ids)
+
+
+
+class SyntheticGameLibrary(GameLibrary):
+    """GameLibrary that answers GetOwnedGames from a generated owned_games.json instead of the network."""
+    def __init__(self, steam_path, owned_games_file):
+        super().__init__(steam_path, "0" * 32, "76561198000000000")
+        self.owned_games_file = owned_games_file
+
+
+    def fetch_owned_games(self, steam_id=None, api_key=None):
+        with open(self.owned_games_file, encoding="utf-8") as file:
+            return json.load(file)
@@ -0,0 +1,244 @@
+"""Library loading, filtering and sorting benchmarks over generated Steam trees.
+
+Run from src/:
+    python -m Benchmarks.Suite --sizes 1000 10000 50000 --output results.json
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import platform
+import argparse
+import tempfile
+import statistics
+import subprocess
+from pathlib import Path
+from contextlib import redirect_stdout
+
+from Benchmarks.Generator import generate_library, SyntheticGameLibrary
+from Classes.CLI import HeadlessLibrary
+from Classes.Utils.SortIndex import SortIndex
+from Classes.Utils.Facets import mask_to_flags
+
+
+TYPED_QUERIES = ["s", "sh", "sha", "shad", "shado", "shadow", "shadow k", "shadow kn"]  # One keystroke at a time
+FACET_QUERIES = ["is:installed", "is:unplayed", "playtime:100h+ -is:installed", "played:year size:1-10gb"]
+
+
+
+def measure(func, repeat, setup=None):
+    """Runs func repeat times, calling setup first each time outside the timer; returns the durations."""
+    durations = []
+    for _ in range(repeat):
+        args = setup() if setup else ()
+        started = time.perf_counter()
+        func(*args)
+        durations.append(time.perf_counter() - started)
+    return durations
+
+
+def result(name, size, items, durations):
+    best = min(durations)
+    return {
+        "benchmark": name,
+        "games": size,
+        "items": items,
+        "runs": len(durations),
+        "best_seconds": round(best, 6),
+        "median_seconds": round(statistics.median(durations), 6),
+        "items_per_second": round(items / best, 1) if best else None,
+    }
+
+
+def bench_size(size, repeat, work_dir, with_gui):
+    """Generates a library of size games and benchmarks every stage over it."""
+    tree = generate_library(work_dir / f"library_{size}", size, covers=with_gui)
+    exclusion_file = tree["exclusion_file"]
+
+
+    def make_library():
+        return (SyntheticGameLibrary(tree["steam_path"], tree["owned_games_file"]),)
+
+    results = []
+    with redirect_stdout(sys.stderr):  # SteamLib reports problems with print()
+        installed = make_library()[0].get_installed_games()
+        results.append(result("scan", size, len(installed), measure(lambda lib: lib.get_installed_games(), repeat, make_library)))
+
+        results.append(result("exclusion", size, tree["owned"], measure(lambda lib: lib.get_owned_games(exclusion_file), repeat, make_library)))
+
+        library = make_library()[0]
+        games = library.get_all_games(exclusion_file)
+        results.append(result("merge", size, len(games), measure(lambda lib: lib.get_all_games(exclusion_file), repeat, make_library)))
+
+
+    def make_headless():
+        return (HeadlessLibrary(Path(tree["app_root"])),)
+
+    results.append(result("index", size, len(games), measure(
+        lambda headless: headless.store.index_games(games, library.library_folders), repeat, make_headless)))
+
+    headless = make_headless()[0]
+    headless.store.index_games(games, library.library_folders)
+    results.append(result("filter_typing", size, len(TYPED_QUERIES), measure(
+        lambda: [headless.store.query(query) for query in TYPED_QUERIES], repeat)))
+    results.append(result("filter_facets", size, len(FACET_QUERIES), measure(
+        lambda: [headless.store.query("", [query]) for query in FACET_QUERIES], repeat)))
+
+    # Every sort option, over the whole library and over the installed games
+    installed_flags = mask_to_flags(headless.store.facet_index.get("is:installed"), len(games))
+    orders = [(criterion, reverse, flags) for criterion in SortIndex.CRITERIA for reverse in (False, True) for flags in (None, installed_flags)]
+    results.append(result("sort", size, len(orders), measure(
+        lambda: [headless.store.sort_index.order(*order) for order in orders], repeat)))
+
+    if with_gui:
+        results.extend(bench_list_population(size, games, headless, tree, repeat))
+        results.extend(bench_window(size, games, library, tree, repeat))
+    return tree, results
+
+
+def bench_list_population(size, games, headless, tree, repeat):
+    """Times filling the game list view and narrowing it the way a search does."""
+    from PyQt5.QtGui import QPixmap
+    from PyQt5.QtWidgets import QApplication, QListView
+    from Classes.GUI.GameList import GameListModel, GameItemDelegate
+
+    app = QApplication.instance() or QApplication([])
+    cover_dir = os.path.join(tree["app_root"], "Cache", "Games")
+    pixmaps = {}
+    durations = measure(lambda: pixmaps.update(
+        (game[1], QPixmap(os.path.join(cover_dir, f"game_{game[1]}.jpg"))) for game in games[:1000]
+    ), repeat)
+    results = [result("cover_decode", size, min(len(games), 1000), durations)]
+
+    view = QListView()
+    view.setUniformItemSizes(True)
+    model = GameListModel(pixmaps)
+    view.setModel(model)
+    view.setItemDelegate(GameItemDelegate(view))
+    view.resize(400, 800)
+    view.show()
+
+    ordered = headless.store.query()
+    narrowed = headless.store.query("shadow")
+
+
+    def populate():
+        model.set_games(ordered)
+        app.processEvents()
+
+
+    def narrow():
+        model.update_rows(narrowed)
+        app.processEvents()
+
+    results.append(result("list_populate", size, len(ordered), measure(populate, repeat, lambda: model.clear() or ())))
+    results.append(result("list_narrow", size, len(ordered) - len(narrowed), measure(
+        narrow, repeat, lambda: model.set_games(ordered) or ())))
+    view.close()
+    return results
+
+
+def bench_window(size, games, library, tree, repeat):
+    """Times typing and switching sorts in the main window itself, including the rows it repaints."""
+    from PyQt5.QtWidgets import QApplication
+    from Classes.Main import MainWindow
+
+    app = QApplication.instance() or QApplication([])
+
+
+    class BenchWindow(MainWindow):
+        """The main window without the Steam load it starts on its own, so only the timed calls run."""
+        def check_required_settings(self):
+            pass
+
+    window = BenchWindow(Path(tree["app_root"]))
+    window.store.index_games(games, library.library_folders)
+    window.resize(800, 900)
+    window.show()
+    window.filter_games()
+    app.processEvents()
+
+
+    def clear_search():
+        window.filter_lineEdit.setText("")
+        window.filter_games()
+        app.processEvents()
+        return ()
+
+
+    def type_queries():
+        for query in TYPED_QUERIES:
+            window.filter_lineEdit.setText(query)
+            window.filter_games()  # What the typing delay would run
+            app.processEvents()
+
+
+    def switch_sorts():
+        for index in range(window.filter_comboBox.count()):
+            window.filter_comboBox.setCurrentIndex(index)  # Runs sort_games
+            app.processEvents()
+
+    results = [result("window_filter_typing", size, len(TYPED_QUERIES), measure(type_queries, repeat, clear_search))]
+    results.append(result("window_sort", size, window.filter_comboBox.count(), measure(switch_sorts, repeat, clear_search)))
+    window.close()
+    return results
+
+
+def environment():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, cwd=os.path.dirname(__file__)).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "timestamp": int(time.time()),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark library scanning, merging, filtering and sorting.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000], help="library sizes to generate")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per benchmark; the best and median are reported")
+    parser.add_argument("--output", help="write the JSON here instead of stdout")
+    parser.add_argument("--work-dir", help="where to generate libraries (default: a temporary directory)")
+    parser.add_argument("--keep", action="store_true", help="keep the generated libraries")
+    parser.add_argument("--no-gui", action="store_true", help="skip the benchmarks that need PyQt5")
+    args = parser.parse_args(argv)
+
+    with_gui = not args.no_gui
+    if with_gui:
+        try:
+            import PyQt5.QtWidgets
+            os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")  # Works on hosts without a display
+        except ImportError:
+            print("PyQt5 is not available, skipping the list benchmarks", file=sys.stderr)
+            with_gui = False
+
+    work_dir = Path(args.work_dir or tempfile.mkdtemp(prefix="steam_bench_"))
+    report = {"environment": environment(), "libraries": [], "results": []}
+    try:
+        for size in args.sizes:
+            print(f"Benchmarking {size} games...", file=sys.stderr)
+            tree, results = bench_size(size, args.repeat, work_dir, with_gui)
+            report["libraries"].append(tree)
+            report["results"].extend(results)
+    finally:
+        if not args.keep:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(output + "\n")
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
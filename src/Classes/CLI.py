@@ -0,0 +1,179 @@
+import sys
+import json
+import random
+import argparse
+from contextlib import redirect_stdout
+
+from Classes.Functions import open_steam_url
+from Classes.Utils.SteamLib import GameLibrary, configured_accounts
+from Classes.Utils.Config import JSONConfig
+from Classes.Utils.Store import GameStore
+from Classes.Utils.DiskUsage import DiskUsageScanner
+from Classes.Utils.Snapshot import save_snapshot, load_snapshot
+from Classes.Utils import Tracing
+
+
+FIELDS = ["name", "appid", "last_played", "last_updated", "size_on_disk", "installed", "playtime"]
+SORTS = ["name", "last_played", "last_updated", "size", "disk_usage", "workshop_size", "playtime"]
+
+
+
+class HeadlessLibrary:
+    """Loads the main window's game store without any Qt.
+
+    Reads the same config, exclusion file, library snapshot and description cache
+    as the GUI, so both see the same library.
+    """
+    def __init__(self, root_path):
+        self.config = JSONConfig(root_path / "config.json")
+        Tracing.configure(self.config.get_value(1, "trace_file"))
+        self.cache_dir = root_path / "Cache"
+        self.steam_path = self.config.get_value(1, "steam_path")
+        self.api_key = self.config.get_value(1, "api_key")
+        self.steam_id = self.config.get_value(1, "profile_id")
+        self.exclusion_file = self.config.get_value(1, "exclusion_file")
+        self.store = GameStore(self.cache_dir / "description_index.json", self.config.get_value(1, "fuzzy_search") or False)
+        self.game_library = GameLibrary(self.steam_path or "", self.api_key, self.steam_id,
+                                        configured_accounts(self.config), self.cache_dir / "Accounts")
+        self.snapshot_file = self.cache_dir / "library.snapshot"
+
+
+    def load(self, refresh=False):
+        """Fills the indexes from the snapshot, or from Steam when refresh is set or there is no snapshot."""
+        if not self.steam_path:
+            raise SystemExit("No Steam path configured; set one in the GUI first.")
+
+        snapshot = None if refresh else load_snapshot(self.snapshot_file, (self.steam_path, self.steam_id))
+        if snapshot:
+            self.store.facet_index.account_names = snapshot["account_names"]
+            self.store.index_games(snapshot["games"], snapshot["library_folders"], snapshot["owners"], snapshot["workshop"])
+            return
+
+        # SteamLib reports problems with print(); keep them out of the data on stdout
+        with redirect_stdout(sys.stderr):
+            games = self.game_library.get_all_games(self.exclusion_file)
+        self.store.facet_index.account_names = self.game_library.account_names
+        self.store.index_games(games, self.game_library.library_folders, self.game_library.owners, self.game_library.workshop)
+
+        try:
+            save_snapshot(
+                self.snapshot_file, self.store.games, self.game_library.library_folders,
+                self.game_library.install_filter, (self.steam_path, self.steam_id),
+                self.game_library.owners, self.game_library.account_names, self.game_library.workshop,
+            )
+        except Exception as e:
+            print(f"Error saving library snapshot: {e}", file=sys.stderr)
+
+
+    def scan_disk_usage(self):
+        """Measures Proton prefixes, shader caches and workshop content so "disk_usage" sorts by real totals."""
+        usage = DiskUsageScanner(self.cache_dir / "disk_usage.cache").scan(self.game_library.get_library_paths())
+        self.store.set_disk_usage(usage)
+
+
+
+def write_games(games, output_format, file):
+    """Writes game tuples as JSON objects, TSV rows or plain "name (appid)" lines."""
+    if output_format == "json":
+        json.dump([dict(zip(FIELDS, game)) for game in games], file, indent=2, ensure_ascii=False)
+        file.write("\n")
+    elif output_format == "tsv":
+        file.write("\t".join(FIELDS) + "\n")
+        for game in games:
+            # Tabs and newlines in names would break the columns
+            file.write("\t".join(" ".join(str(value).split()) for value in game) + "\n")
+    else:
+        for game in games:
+            file.write(f"{game[0]} ({game[1]})\n")
+
+
+def build_parser():
+    query_options = argparse.ArgumentParser(add_help=False)
+    query_options.add_argument("-f", "--filter", action="append", default=[], metavar="TERMS",
+                               help='facet terms such as "is:installed" or "-genre:indie"; repeat to require several')
+    query_options.add_argument("-s", "--sort", choices=SORTS, default="name")
+    query_options.add_argument("-r", "--reverse", action="store_true", help="reverse the sort order")
+    query_options.add_argument("--installed", action="store_true", help='shorthand for --filter is:installed')
+    query_options.add_argument("--fuzzy", action="store_true", help="fall back to typo tolerant matching")
+    query_options.add_argument("-n", "--limit", type=int, help="show at most this many games")
+
+    output_options = argparse.ArgumentParser(add_help=False)
+    output_options.add_argument("-o", "--format", choices=["text", "json", "tsv"], default="text", dest="output_format")
+
+    parser = argparse.ArgumentParser(prog="cli.py", description="Query the Steam library without the GUI.")
+    parser.add_argument("--refresh", action="store_true", help="fetch the library from Steam instead of the last snapshot")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    list_parser = commands.add_parser("list", parents=[query_options, output_options], help="list games")
+    list_parser.add_argument("query", nargs="?", default="", help="search text, as typed in the search box")
+
+    search_parser = commands.add_parser("search", parents=[query_options, output_options], help="search names, app ids and descriptions")
+    search_parser.add_argument("query")
+
+    random_parser = commands.add_parser("random", parents=[query_options, output_options], help="pick random games")
+    random_parser.add_argument("query", nargs="?", default="")
+    random_parser.add_argument("-c", "--count", type=int, default=1)
+    random_parser.add_argument("--launch", action="store_true", help="launch the picked game")
+
+    launch_parser = commands.add_parser("launch", help="launch a game or open its store page")
+    launch_parser.add_argument("game", help="app id or name")
+    launch_parser.add_argument("--store", action="store_true", help="open the store page instead")
+
+    export_parser = commands.add_parser("export", parents=[query_options], help="write games to a file")
+    export_parser.add_argument("file")
+    export_parser.add_argument("query", nargs="?", default="")
+    export_parser.add_argument("-o", "--format", choices=["json", "tsv"], dest="output_format",
+                               help="defaults to the file extension")
+    return parser
+
+
+def run_query(library, args):
+    filters = args.filter + (["is:installed"] if args.installed else [])
+    if args.sort == "disk_usage":
+        library.scan_disk_usage()
+    games = library.store.query(args.query, filters, args.sort, args.reverse, fuzzy=args.fuzzy)
+    return games[:args.limit] if args.limit is not None else games
+
+
+def launch(library, game, mode):
+    try:
+        # Detached so the command returns even when this starts the Steam client
+        open_steam_url(library.steam_path, game[1], mode)
+    except OSError as e:
+        print(f"Failed to launch {game[0]}: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def main(root_path, argv=None):
+    args = build_parser().parse_args(argv)
+    library = HeadlessLibrary(root_path)
+    library.load(refresh=args.refresh)
+
+    if args.command in ("list", "search"):
+        write_games(run_query(library, args), args.output_format, sys.stdout)
+
+    elif args.command == "random":
+        games = run_query(library, args)
+        if not games:
+            print("No games match.", file=sys.stderr)
+            return 1
+        picked = random.sample(games, min(args.count, len(games)))
+        write_games(picked, args.output_format, sys.stdout)
+        if args.launch:
+            return launch(library, picked[0], "launch")
+
+    elif args.command == "launch":
+        games = library.store.find(args.game)
+        if len(games) != 1:
+            print(f"{'No game' if not games else 'Several games'} match {args.game!r}.", file=sys.stderr)
+            write_games(games[:20], "text", sys.stderr)
+            return 1
+        return launch(library, games[0], "store" if args.store else "launch")
+
+    elif args.command == "export":
+        output_format = args.output_format or ("tsv" if args.file.lower().endswith((".tsv", ".txt")) else "json")
+        with open(args.file, "w", encoding="utf-8", newline="") as file:
+            write_games(run_query(library, args), output_format, file)
+
+    return 0
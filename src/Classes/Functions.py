@@ -1,26 +1,54 @@
 import os
 import sys
+import shutil
 import subprocess
 import webbrowser
 
-from PyQt5.QtWidgets import QMessageBox
 
 
+def steam_url(app_id, mode):
+    """Returns the steam:// URL that launches a game or opens its store page."""
+    return f"steam://run/{app_id}" if mode == "launch" else f"steam://store/{app_id}"
 
-def launch_game(steam_path, app_id, mode):
-    """Launch the Steam game using the Steam protocol."""
+
+def steam_command(steam_path, app_id, mode):
+    """Builds the command that hands a steam:// URL for app_id to the Steam client."""
     file_name = 'steam.exe' if sys.platform.startswith('win') else 'steam.sh'
+    return [os.path.join(steam_path, file_name), steam_url(app_id, mode)]
 
-    if mode == "launch":
-        command = f"steam://run/{app_id}"
-    elif mode == "store":
-        command = f"steam://store/{app_id}"
 
+def steam_is_running():
+    """Checks the pid file the Linux client writes; False wherever that can't be told."""
     try:
-        # This opens the game in the Steam client using the app_id
-        subprocess.run([os.path.join(steam_path, file_name), command])
-    except Exception as e:
-        QMessageBox.warning(parent, "Launch Failed", f"Failed to launch the game: {e}")
+        with open(os.path.expanduser("~/.steam/steam.pid")) as file:
+            os.kill(int(file.read().strip()), 0)  # Signal 0 only checks that the process exists
+        return True
+    except (OSError, ValueError):
+        return False
+
+
+def open_steam_url(steam_path, app_id, mode):
+    """Hands a steam:// URL to Steam without waiting for it.
+
+    A running client gets the URL through the desktop's URL handler; otherwise the
+    client is started detached with the URL. Returns the spawned process, or None
+    when the OS handed the URL over directly. Raises OSError if nothing could be started.
+    """
+    url = steam_url(app_id, mode)
+    if sys.platform.startswith('win'):
+        os.startfile(url)  # The registered protocol handler passes it to Steam and returns
+        return None
+
+    if sys.platform == 'darwin':
+        command = ["open", url]
+    elif steam_is_running() and shutil.which("xdg-open"):
+        command = ["xdg-open", url]
+    else:
+        command = steam_command(steam_path, app_id, mode)
+
+    # New session, so the client outlives us and never ties up our terminal or signals
+    return subprocess.Popen(command, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                            stderr=subprocess.DEVNULL, start_new_session=True)
 
 
 
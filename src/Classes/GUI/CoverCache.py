@@ -0,0 +1,89 @@
+import os
+from collections import OrderedDict
+from PyQt5.QtGui import QPixmap
+
+
+
+class CoverCache:
+    """Least recently used covers, keyed by app id and held under a memory budget.
+
+    Covers pushed out of memory are read back from the loader's disk cache the next
+    time a row asks for them, so only rows that were painted recently stay resident.
+    """
+    def __init__(self, cover_dir, budget_mb=64):
+        self.cover_dir = cover_dir
+        self.budget = int(budget_mb * 1024 * 1024)
+        self.pixmaps = OrderedDict()  # app_id -> QPixmap, least recently used first
+        self.used = 0  # Bytes held by self.pixmaps
+        self.absent = set()  # App ids known to have no cover file, so misses don't hit the disk again
+        self.unbacked = set()  # Evicted app ids whose cover was a generated placeholder
+        self.placeholder = None  # One shared copy of that placeholder
+
+
+    def __len__(self):
+        return len(self.pixmaps)
+
+
+    def __setitem__(self, app_id, pixmap):
+        """Stores a cover; None records that it is in the disk cache, to be read when first painted."""
+        self.absent.discard(app_id)
+        self.unbacked.discard(app_id)
+        if pixmap is not None:
+            self._insert(app_id, pixmap)
+
+
+    def get(self, app_id, default=None):
+        pixmap = self.pixmaps.get(app_id)
+        if pixmap is not None:
+            self.pixmaps.move_to_end(app_id)
+            return pixmap
+
+        if app_id in self.unbacked:
+            return self.placeholder
+        if app_id in self.absent:
+            return default
+
+        pixmap = QPixmap(self.path(app_id))
+        if pixmap.isNull():
+            self.absent.add(app_id)
+            return default
+        self._insert(app_id, pixmap)
+        return pixmap
+
+
+    def clear(self):
+        self.pixmaps.clear()
+        self.absent.clear()
+        self.unbacked.clear()
+        self.used = 0
+
+
+    def path(self, app_id):
+        return os.path.join(self.cover_dir, f"game_{app_id}.jpg")
+
+
+    def stats(self):
+        return {"covers": len(self.pixmaps), "used_mb": round(self.used / 1048576, 1), "budget_mb": round(self.budget / 1048576, 1)}
+
+
+    def _insert(self, app_id, pixmap):
+        old = self.pixmaps.pop(app_id, None)
+        if old is not None:
+            self.used -= self.cost(old)
+        self.pixmaps[app_id] = pixmap
+        self.used += self.cost(pixmap)
+
+        # Evict from the least recently used end, always keeping the newest cover
+        while self.used > self.budget and len(self.pixmaps) > 1:
+            evicted_id, evicted = self.pixmaps.popitem(last=False)
+            self.used -= self.cost(evicted)
+            if not os.path.exists(self.path(evicted_id)):
+                # A generated placeholder can't be reloaded; reuse one shared copy for all of them
+                self.unbacked.add(evicted_id)
+                if self.placeholder is None:
+                    self.placeholder = evicted
+
+
+    @staticmethod
+    def cost(pixmap):
+        return pixmap.width() * pixmap.height() * max(pixmap.depth(), 8) // 8
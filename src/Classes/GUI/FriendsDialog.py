@@ -0,0 +1,173 @@
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton, QListWidget, QListWidgetItem, QComboBox, QProgressBar
+from Classes.LoaderThread import FriendsLoaderThread
+from Classes.Utils.Friends import FriendLibraries, overlap
+
+
+
+class FriendsDialog(QDialog):
+    """Picks friends to play with and narrows the game list to games shared with them.
+
+    The friend list and libraries are fetched on a FriendsLoaderThread, so the window stays
+    responsive however many friends are selected.
+    """
+    MODES = [("Games everyone owns", "all"), ("Games any of them owns", "any")]
+
+
+    def __init__(self, parent=None, centered=False, first=False):
+        super().__init__(parent)
+        self.setWindowFlags(self.windowFlags() & ~Qt.WindowContextHelpButtonHint)
+        self.setWindowTitle("Play With Friends")
+        self.setGeometry(300, 300, 360, 480)
+        self.reload = False
+        self.friends = []
+        self.loader = None
+        self.friend_libraries = FriendLibraries(parent.game_library, parent.cache_dir / "Friends")
+        self.selected = set(parent.config.get_value(1, "friends") or [])  # Friends checked last time
+
+        layout = QVBoxLayout(self)
+
+        self.search_edit = QLineEdit(self)
+        self.search_edit.setPlaceholderText("Search friends")
+        self.search_edit.textChanged.connect(self.filter_friends)
+        layout.addWidget(self.search_edit)
+
+        self.friend_list = QListWidget(self)
+        layout.addWidget(self.friend_list)
+
+        self.mode_comboBox = QComboBox(self)
+        for text, mode in self.MODES:
+            self.mode_comboBox.addItem(text, mode)
+        self.mode_comboBox.setCurrentIndex(max(0, self.mode_comboBox.findData(parent.config.get_value(1, "friends_mode") or "all")))
+        layout.addWidget(self.mode_comboBox)
+
+        self.status_label = QLabel("Loading friends...", self)
+        layout.addWidget(self.status_label)
+        self.progress_bar = QProgressBar(self)
+        self.progress_bar.hide()
+        layout.addWidget(self.progress_bar)
+
+        buttons = QHBoxLayout()
+        self.refresh_button = QPushButton("Refresh", self)
+        self.refresh_button.clicked.connect(lambda: self.load_friends(refresh=True))
+        self.apply_button = QPushButton("Apply", self)
+        self.apply_button.clicked.connect(self.apply)
+        clear_button = QPushButton("Show All Games", self)
+        clear_button.clicked.connect(self.clear)
+        for button in (self.refresh_button, self.apply_button, clear_button):
+            buttons.addWidget(button)
+        layout.addLayout(buttons)
+
+        self.center_window(parent)
+        self.load_friends()
+
+
+    def center_window(self, parent):
+        """Center the dialog window relative to its parent."""
+        parent_rect = parent.geometry()
+        x = parent_rect.left() + (parent_rect.width() - self.width()) // 2
+        y = parent_rect.top() + (parent_rect.height() - self.height()) // 2
+        self.move(x, y)
+
+
+    def start_loader(self, loader):
+        """Runs loader in place of the current one, which is cancelled but kept until it exits."""
+        self.stop_loader()
+        self.loader = loader
+        loader.failed.connect(self.on_failed)
+        loader.start()
+
+
+    def stop_loader(self):
+        loader, self.loader = self.loader, None
+        if loader is not None:
+            self.parent().retire(loader)  # The main window outlives the dialog, so it holds on to the thread
+
+
+    def load_friends(self, refresh=False):
+        self.selected = self.checked_ids() or self.selected
+        self.set_busy(True, "Loading friends...")
+        loader = FriendsLoaderThread(self.friend_libraries, refresh=refresh)
+        loader.friends_loaded.connect(self.on_friends_loaded)
+        self.start_loader(loader)
+
+
+    def on_friends_loaded(self, friends):
+        self.friends = friends
+        self.friend_list.clear()
+        for friend in friends:
+            item = QListWidgetItem(friend["name"], self.friend_list)
+            item.setData(Qt.UserRole, friend)
+            item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
+            item.setCheckState(Qt.Checked if friend["steam_id"] in self.selected else Qt.Unchecked)
+        self.filter_friends(self.search_edit.text())
+        self.set_busy(False, f"{len(friends)} friends")
+
+
+    def filter_friends(self, text):
+        text = text.casefold()
+        for row in range(self.friend_list.count()):
+            item = self.friend_list.item(row)
+            item.setHidden(text not in item.text().casefold())
+
+
+    def checked_ids(self):
+        return [self.friend_list.item(row).data(Qt.UserRole)["steam_id"] for row in range(self.friend_list.count())
+                if self.friend_list.item(row).checkState() == Qt.Checked]
+
+
+    def apply(self):
+        """Fetches the checked friends' libraries; the list is narrowed once they are all in."""
+        checked = set(self.checked_ids())
+        friends = [friend for friend in self.friends if friend["steam_id"] in checked]
+        if not friends:
+            self.status_label.setText("Select at least one friend")
+            return
+
+        self.set_busy(True, f"Fetching {len(friends)} libraries...")
+        self.progress_bar.setRange(0, len(friends))
+        self.progress_bar.setValue(0)
+        self.progress_bar.show()
+        loader = FriendsLoaderThread(self.friend_libraries, friends)
+        loader.progress_update.connect(lambda done, total: self.progress_bar.setValue(done))
+        loader.libraries_loaded.connect(lambda libraries: self.on_libraries_loaded(friends, libraries))
+        self.start_loader(loader)
+
+
+    def on_libraries_loaded(self, friends, libraries):
+        self.progress_bar.hide()
+        self.set_busy(False, "")
+        mode = self.mode_comboBox.currentData()
+        hidden = [friend["name"] for friend in friends if libraries.get(friend["steam_id"]) is None]
+        shared = overlap(libraries.values(), mode)
+        if not shared:
+            self.status_label.setText("No libraries could be read; they may be private" if hidden else "No games in common")
+            return
+
+        names = [friend["name"] for friend in friends if friend["name"] not in hidden]
+        self.parent().config.add_entry(1, "friends", [friend["steam_id"] for friend in friends], "list")
+        self.parent().config.add_entry(1, "friends_mode", mode, "str")
+        self.parent().set_friend_filter({str(app_id) for app_id in shared}, names, hidden)
+        self.accept()
+
+
+    def clear(self):
+        self.parent().set_friend_filter(None)
+        self.accept()
+
+
+    def on_failed(self, error):
+        self.progress_bar.hide()
+        self.set_busy(False, f"Error: {error}")
+
+
+    def set_busy(self, busy, message):
+        self.refresh_button.setEnabled(not busy)
+        self.apply_button.setEnabled(not busy)
+        self.status_label.setText(message)
+
+
+    def done(self, result):
+        """Stops a fetch still in progress whichever way the dialog is closed."""
+        self.stop_loader()
+        super().done(result)
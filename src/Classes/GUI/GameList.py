@@ -0,0 +1,176 @@
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex, QRect, QSize
+from PyQt5.QtGui import QColor, QPalette
+from PyQt5.QtWidgets import QStyledItemDelegate, QStyle
+
+
+
+class GameListModel(QAbstractListModel):
+    """List model over game tuples; covers are looked up by app id when a row is painted."""
+    GameRole = Qt.UserRole + 1  # Returns the full game tuple
+    StatusRole = Qt.UserRole + 2  # Returns a download/update line, or None for a plain install
+    STATUS_TEXT = {"update-required": "Update required", "downloading": "Downloading", "paused": "Paused",
+                   "staging": "Staging", "staged": "Update staged", "incomplete": "Incomplete install"}
+
+
+    def __init__(self, pixmaps, parent=None, install_states=None):
+        super().__init__(parent)
+        self.rows = []  # Game tuples in display order
+        self.pixmaps = pixmaps  # CoverCache (app_id -> QPixmap), shared with the main window
+        self.install_states = install_states if install_states is not None else {}  # Also shared
+
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        game = self.rows[index.row()]
+        if role == Qt.DisplayRole:
+            return game[0]
+        if role == Qt.DecorationRole:
+            return self.pixmaps.get(game[1])
+        if role == Qt.ForegroundRole:
+            return QColor("green") if game[5] else QColor("red")
+        if role == self.GameRole:
+            return game
+        if role == self.StatusRole:
+            return self.status_text(game[1])
+        return None
+
+
+    def status_text(self, app_id):
+        state, progress, _ = self.install_states.get(app_id, ("installed", None, 0))
+        if state not in self.STATUS_TEXT:
+            return None
+        return self.STATUS_TEXT[state] + (f" {progress:.0%}" if progress is not None else "")
+
+
+    def set_games(self, games):
+        """Replaces every row in one reset."""
+        self.beginResetModel()
+        self.rows = list(games)
+        self.endResetModel()
+
+
+    def append_games(self, games):
+        """Appends rows at the end of the list."""
+        if not games:
+            return
+        start = len(self.rows)
+        self.beginInsertRows(QModelIndex(), start, start + len(games) - 1)
+        self.rows.extend(games)
+        self.endInsertRows()
+
+
+    def update_rows(self, games):
+        """Moves to a new row list by removing and inserting only the rows that differ.
+
+        Rows present in both lists are expected to keep their relative order (same sort);
+        if an updated game moved, the model falls back to a reset.
+        """
+        new_rows = {game[1]: row for row, game in enumerate(games)}
+        kept = [new_rows[game[1]] for game in self.rows if game[1] in new_rows]
+        if any(later < earlier for earlier, later in zip(kept, kept[1:])):
+            self.set_games(games)
+            return
+
+        keep = new_rows
+
+        # Remove contiguous runs of rows that are gone, from the bottom up so indices stay valid
+        row = len(self.rows) - 1
+        while row >= 0:
+            if self.rows[row][1] in keep:
+                row -= 1
+                continue
+            end = row
+            while row >= 0 and self.rows[row][1] not in keep:
+                row -= 1
+            self.beginRemoveRows(QModelIndex(), row + 1, end)
+            del self.rows[row + 1:end + 1]
+            self.endRemoveRows()
+
+        # What's left is a subsequence of games, so insert the missing runs top down
+        present = {game[1] for game in self.rows}
+        row = 0
+        while row < len(games):
+            if games[row][1] in present:
+                row += 1
+                continue
+            start = row
+            while row < len(games) and games[row][1] not in present:
+                row += 1
+            self.beginInsertRows(QModelIndex(), start, row - 1)
+            self.rows[start:start] = games[start:row]
+            self.endInsertRows()
+
+        # Rows that stayed may carry updated game data
+        changed = [row for row, game in enumerate(games) if self.rows[row] is not game]
+        if changed:
+            self.rows = list(games)
+            self.dataChanged.emit(self.index(changed[0]), self.index(changed[-1]))
+
+
+    def refresh_status(self, app_ids):
+        """Repaints the rows of games whose install state changed."""
+        for row, game in enumerate(self.rows):
+            if game[1] in app_ids:
+                self.dataChanged.emit(self.index(row), self.index(row), [self.StatusRole])
+
+
+    def refresh_covers(self):
+        """Repaints every row's cover after the shared pixmap dict changed."""
+        if self.rows:
+            self.dataChanged.emit(self.index(0), self.index(len(self.rows) - 1), [Qt.DecorationRole])
+
+
+    def clear(self):
+        self.set_games([])
+
+
+
+class GameItemDelegate(QStyledItemDelegate):
+    """Paints a row as the cover followed by the name, colored by install state."""
+    COVER_SIZE = QSize(80, 120)
+    MARGIN = 6  # Space around the cover and between the cover and the name
+    ROW_HEIGHT = COVER_SIZE.height() + 2 * MARGIN
+
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), self.ROW_HEIGHT)
+
+
+    def paint(self, painter, option, index):
+        painter.save()
+
+        if option.state & QStyle.State_Selected:
+            painter.fillRect(option.rect, option.palette.highlight())
+        elif option.state & QStyle.State_MouseOver:
+            painter.fillRect(option.rect, option.palette.alternateBase())
+
+        # Cover, centered in its box so narrower art doesn't shift the text
+        cover_rect = QRect(option.rect.left() + self.MARGIN, option.rect.top() + self.MARGIN,
+                           self.COVER_SIZE.width(), self.COVER_SIZE.height())
+        pixmap = index.data(Qt.DecorationRole)
+        if pixmap is not None and not pixmap.isNull():
+            x = cover_rect.left() + (cover_rect.width() - pixmap.width()) // 2
+            y = cover_rect.top() + (cover_rect.height() - pixmap.height()) // 2
+            painter.drawPixmap(x, y, pixmap)
+
+        # Name, with the download or update state under it while there is one
+        text_rect = option.rect.adjusted(cover_rect.right() + self.MARGIN, 0, -self.MARGIN, 0)
+        name = option.fontMetrics.elidedText(index.data(Qt.DisplayRole), Qt.ElideRight, text_rect.width())
+        painter.setFont(option.font)
+        painter.setPen(index.data(Qt.ForegroundRole))
+        status = index.data(GameListModel.StatusRole)
+        if status:
+            line_height = option.fontMetrics.height()
+            painter.drawText(text_rect.adjusted(0, 0, 0, -line_height), Qt.AlignLeft | Qt.AlignVCenter, name)
+            painter.setPen(option.palette.color(QPalette.Disabled, QPalette.Text))
+            painter.drawText(text_rect.adjusted(0, line_height, 0, 0), Qt.AlignLeft | Qt.AlignVCenter, status)
+        else:
+            painter.drawText(text_rect, Qt.AlignLeft | Qt.AlignVCenter, name)
+
+        painter.restore()
@@ -1,11 +1,9 @@
 import os
-import requests
 from io import BytesIO
 from datetime import datetime
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QPixmap
 from PyQt5.QtWidgets import QVBoxLayout, QLabel, QPushButton, QFrame, QDialog
-from Classes.Functions import launch_game
 
 
 
@@ -35,6 +33,19 @@ class GameInfoWindow(QDialog):
         size_label = QLabel(f"Size on Disk: {self.format_size(int(size_on_disk))}")
         layout.addWidget(size_label)
 
+        # Space used outside the install folder, once the background scan has measured it
+        extra = parent.disk_usage.get(app_id, {})
+        parts = [f"{label} {self.format_size(extra[kind])}" for kind, label in
+                 (("compatdata", "Proton prefix"), ("shadercache", "shader cache"), ("workshop", "workshop")) if extra.get(kind)]
+        if parts:
+            usage_label = QLabel(f"Total Disk Usage: {self.format_size(int(size_on_disk) + sum(extra.values()))} (includes {', '.join(parts)})")
+            layout.addWidget(usage_label)
+
+        if app_id in parent.store.workshop:
+            items, workshop_size = parent.store.workshop[app_id]
+            workshop_label = QLabel(f"Workshop: {items} item{'s' if items != 1 else ''}, {self.format_size(workshop_size)}")
+            layout.addWidget(workshop_label)
+
         playtime_label = QLabel(f"Playtime: {self.format_playtime(int(playtime))}")
         layout.addWidget(playtime_label)
 
@@ -58,7 +69,7 @@ class GameInfoWindow(QDialog):
         # Launch button
         launch_button = QPushButton("Launch")
         launch_button.setEnabled(installed)
-        launch_button.clicked.connect(lambda: [launch_game(steam_path, app_id, "launch", self.parent()), self.close()])
+        launch_button.clicked.connect(lambda: [parent.launch_game(app_id, "launch"), self.close()])
         layout.addWidget(launch_button)
 
         # Close button
@@ -77,6 +88,7 @@ class GameInfoWindow(QDialog):
 
         # If not cached, download and save the image
         try:
+            import requests
             response = requests.get(url, timeout=10)
             if response.status_code == 200:
                 pixmap = QPixmap()
@@ -50,6 +50,8 @@ class Ui_MainWindow(object):
         self.filter_comboBox.addItem("")
         self.filter_comboBox.addItem("")
         self.filter_comboBox.addItem("")
+        self.filter_comboBox.addItem("")
+        self.filter_comboBox.addItem("")
         self.horizontalLayout.addWidget(self.filter_comboBox)
         self.filter_checkBox = QtWidgets.QCheckBox(self.tab)
         sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Preferred, QtWidgets.QSizePolicy.Fixed)
@@ -60,9 +62,10 @@ class Ui_MainWindow(object):
         self.filter_checkBox.setObjectName("filter_checkBox")
         self.horizontalLayout.addWidget(self.filter_checkBox)
         self.verticalLayout_2.addLayout(self.horizontalLayout)
-        self.listWidget = QtWidgets.QListWidget(self.tab)
-        self.listWidget.setObjectName("listWidget")
-        self.verticalLayout_2.addWidget(self.listWidget)
+        self.listView = QtWidgets.QListView(self.tab)
+        self.listView.setUniformItemSizes(True)
+        self.listView.setObjectName("listView")
+        self.verticalLayout_2.addWidget(self.listView)
         self.random_pushButton = QtWidgets.QPushButton(self.tab)
         self.random_pushButton.setObjectName("random_pushButton")
         self.verticalLayout_2.addWidget(self.random_pushButton)
@@ -137,8 +140,10 @@ class Ui_MainWindow(object):
         self.filter_comboBox.setItemText(1, _translate("MainWindow", "Last Played"))
         self.filter_comboBox.setItemText(2, _translate("MainWindow", "Last Updated"))
         self.filter_comboBox.setItemText(3, _translate("MainWindow", "Size on Disk"))
-        self.filter_comboBox.setItemText(4, _translate("MainWindow", "Playtime High to Low"))
-        self.filter_comboBox.setItemText(5, _translate("MainWindow", "Playtime Low to High"))
+        self.filter_comboBox.setItemText(4, _translate("MainWindow", "Total Disk Usage"))
+        self.filter_comboBox.setItemText(5, _translate("MainWindow", "Workshop Size"))
+        self.filter_comboBox.setItemText(6, _translate("MainWindow", "Playtime High to Low"))
+        self.filter_comboBox.setItemText(7, _translate("MainWindow", "Playtime Low to High"))
         self.filter_checkBox.setText(_translate("MainWindow", "Installed"))
         self.random_pushButton.setText(_translate("MainWindow", "Random Game"))
         self.tabWidget.setTabText(self.tabWidget.indexOf(self.tab), _translate("MainWindow", "Main"))
@@ -152,4 +157,3 @@ class Ui_MainWindow(object):
         self.actionChoose_Random_Game.setText(_translate("MainWindow", "Choose Random Game"))
         self.actionUpdate_Steam_Path.setText(_translate("MainWindow", "Update Steam Path"))
         self.actionUpdate_API_information.setText(_translate("MainWindow", "Update API information"))
-import Classes.GUI.Resources
@@ -0,0 +1,46 @@
+import subprocess
+import threading
+from PyQt5.QtCore import QObject, pyqtSignal
+from Classes.Functions import open_steam_url
+
+
+
+class GameLauncher(QObject):
+    """Launches games and store pages off the GUI thread and reports back through signals.
+
+    A handler that exits non-zero within SETTLE_SECONDS counts as a failure; one still
+    running by then is taken to be the Steam client itself, which is reaped when it exits.
+    """
+    launched = pyqtSignal(str, str)  # app_id, mode
+    launch_failed = pyqtSignal(str, str, str)  # app_id, mode, error message
+    SETTLE_SECONDS = 5
+
+
+    def launch(self, steam_path, app_id, mode="launch"):
+        """Returns straight away; launched or launch_failed is emitted once the outcome is known."""
+        thread = threading.Thread(target=self._launch, args=(steam_path, str(app_id), mode), name="launcher", daemon=True)
+        thread.start()
+
+
+    def _launch(self, steam_path, app_id, mode):
+        try:
+            process = open_steam_url(steam_path, app_id, mode)
+        except OSError as e:
+            self.launch_failed.emit(app_id, mode, str(e))
+            return
+
+        if process is None:
+            self.launched.emit(app_id, mode)
+            return
+
+        try:
+            code = process.wait(timeout=self.SETTLE_SECONDS)
+        except subprocess.TimeoutExpired:
+            self.launched.emit(app_id, mode)
+            process.wait()  # Still running, so it's the client; wait so it isn't left a zombie
+            return
+
+        if code:
+            self.launch_failed.emit(app_id, mode, f"{process.args[0]} exited with status {code}")
+        else:
+            self.launched.emit(app_id, mode)
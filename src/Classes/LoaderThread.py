@@ -1,53 +1,98 @@
 import os
-import requests
-from PyQt5.QtGui import QPixmap, QColor, QPainter, QFont
-from PyQt5.QtCore import Qt, QThread, pyqtSignal, QThreadPool, QRunnable
+import threading
+from PyQt5.QtGui import QImage, QColor, QPainter, QFont
+from PyQt5.QtCore import Qt, QThread, pyqtSignal
+from Classes.Utils.Scheduler import ImageJobScheduler
+from Classes.Utils.Tracing import span, instant
 
 
 
-class ImageLoaderWorker(QRunnable):
-    """Worker to fetch game images in parallel."""
-    def __init__(self, app_id, cache_dir, session, callback):
-        super().__init__()
-        self.app_id = app_id
+class ImageLoaderWorker:
+    """Fetches one game image, moving between the disk, network and decode pools as needed."""
+    def __init__(self, next_job, cache_dir, session, pools, callback, is_cancelled):
+        self.next_job = next_job  # Returns the most important pending app id when the worker starts
+        self.app_id = None
         self.cache_dir = cache_dir
         self.session = session
+        self.pools = pools
         self.callback = callback  # Function to send back the result
+        self.is_cancelled = is_cancelled  # Returns True once the owning load is stale
 
 
     def run(self):
-        """Download and cache game images."""
-        cached_image_path = os.path.join(self.cache_dir, f"game_{self.app_id}.jpg")
+        """Disk stage: report a cached image, or hand off to the network pool.
+
+        A cached image isn't decoded here; the cover cache reads it when its row is painted.
+        """
+        # Drop out early if a newer load has replaced the one that queued us
+        if self.is_cancelled():
+            return
+
+        # Pick the job at run time so reprioritizing affects workers already queued
+        self.app_id = self.next_job()
+        if self.app_id is None:
+            return
+
+        self.cached_image_path = os.path.join(self.cache_dir, f"game_{self.app_id}.jpg")
         
-        # Load from cache if exists
-        if os.path.exists(cached_image_path):
-            pixmap = QPixmap(cached_image_path)
+        with span("cache lookup", "images", app_id=self.app_id) as trace:
+            cached = os.path.exists(self.cached_image_path)
+            trace.set(hit=cached)
+
+        if cached:
+            self.finish(None)
         else:
-            img_url = f"https://steamcdn-a.akamaihd.net/steam/apps/{self.app_id}/library_600x900_2x.jpg"
-            try:
+            self.pools.start("network", self.download)
+
+
+    def download(self):
+        """Network stage: fetch the raw image bytes."""
+        if self.is_cancelled():
+            return
+
+        img_url = f"https://steamcdn-a.akamaihd.net/steam/apps/{self.app_id}/library_600x900_2x.jpg"
+        try:
+            with span("download", "images", app_id=self.app_id) as trace:
                 response = self.session.get(img_url, timeout=3)  # Fast timeout
-                if response.status_code == 200:
-                    pixmap = QPixmap()
-                    pixmap.loadFromData(response.content)
-                    
-                    if not pixmap.isNull():
-                        pixmap = pixmap.scaled(80, 120, Qt.KeepAspectRatio)
-                        pixmap.save(cached_image_path)  # Save asynchronously
-                    else:
-                        pixmap = self.create_placeholder_image()
-                else:
-                    pixmap = self.create_placeholder_image()
-            except Exception as e:
-                print(f"Error fetching image for {self.app_id}: {e}")
-                pixmap = self.create_placeholder_image()
-
-        self.callback(self.app_id, pixmap)
+                trace.set(status=response.status_code, bytes=len(response.content))
+            if response.status_code == 200:
+                content = response.content
+                self.pools.start("decode", lambda: self.decode(content))
+                return
+        except Exception as e:
+            print(f"Error fetching image for {self.app_id}: {e}")
+        self.finish(self.create_placeholder_image())
+
+
+    def decode(self, content):
+        """Decode stage: turn the downloaded bytes into a thumbnail and cache it.
+
+        Works on a QImage, which unlike QPixmap may be used off the GUI thread; the main
+        window converts it when the batch arrives.
+        """
+        if self.is_cancelled():
+            return
+
+        with span("decode", "images", app_id=self.app_id):
+            image = QImage.fromData(content)
+
+            if not image.isNull():
+                image = image.scaled(80, 120, Qt.KeepAspectRatio)
+                image.save(self.cached_image_path)
+            else:
+                image = self.create_placeholder_image()
+        self.finish(image)
+
+
+    def finish(self, image):
+        if not self.is_cancelled():
+            self.callback(self.app_id, image)
 
 
     def create_placeholder_image(self):
         """Creates a simple placeholder image with text."""
         width, height = 80, 120
-        placeholder = QPixmap(width, height)
+        placeholder = QImage(width, height, QImage.Format_RGB32)
         placeholder.fill(QColor(200, 200, 200))  # Light gray background
 
         # Draw "No Image" text on the placeholder
@@ -61,58 +106,219 @@ class ImageLoaderWorker(QRunnable):
 
 
 
+class ResultBatcher:
+    """Collects finished (game, image) pairs from pool threads and hands them on in batches.
+
+    Pool threads only append; every batch is emitted by the one thread calling flush(), so
+    batches arrive in order and the last one is out before flush() reports completion.
+    """
+    def __init__(self, total, emit, batch_size=64, interval_ms=100):
+        self.total = total
+        self.emit = emit  # Called with (batch, completed) outside of the lock
+        self.batch_size = batch_size
+        self.interval = interval_ms / 1000
+        self.lock = threading.Lock()
+        self.pending = []
+        self.completed = 0  # Only touched while holding the lock
+        self.wake = threading.Event()  # Set when a batch is full or the last result is in
+
+
+    def add(self, game, image):
+        """Queues a result from a pool thread, waking the flushing thread when a batch is ready."""
+        with self.lock:
+            self.pending.append((game, image))
+            self.completed += 1
+            if len(self.pending) >= self.batch_size or self.completed >= self.total:
+                self.wake.set()
+
+
+    def wait(self):
+        """Blocks the flushing thread until a batch is ready or the interval has elapsed."""
+        self.wake.wait(self.interval)
+
+
+    def flush(self):
+        """Emits whatever is pending; returns True once every result has been emitted."""
+        with self.lock:
+            self.wake.clear()
+            batch, self.pending = self.pending, []
+            completed = self.completed
+        if batch:
+            self.emit(batch, completed)
+        return completed >= self.total
+
+
+
 class GameLoaderThread(QThread):
-    game_loaded = pyqtSignal(tuple, QPixmap)  # Signal to update UI with each loaded game and image
-    finished_loading = pyqtSignal()  # Signal when all games are loaded
-    progress_update = pyqtSignal(int)  # Signal to update progress bar
+    # Every signal carries the load generation so the UI can ignore stale loads
+    games_discovered = pyqtSignal(int, list)  # Signal with every game tuple before images start loading
+    games_loaded = pyqtSignal(int, list)  # Signal to update UI with a batch of loaded (game, QImage) pairs; the image is None when cached on disk
+    finished_loading = pyqtSignal(int)  # Signal when all games are loaded
+    progress_update = pyqtSignal(int, int)  # Signal to update progress bar
 
 
-    def __init__(self, game_library, exclusion_file, cache_dir):
+    def __init__(self, game_library, exclusion_file, cache_dir, pools, generation=0):
         super().__init__()
+        self.generation = generation  # Token identifying this load
+        self.cancelled = threading.Event()  # Set once a newer load supersedes this one
         self.game_library = game_library
         self.exclusion_file = exclusion_file
         self.cache_dir = os.path.join(cache_dir, "Games")
-        self.thread_pool = QThreadPool.globalInstance()  # Use a thread pool for parallelism
-        self.session = requests.Session()  # Keep a session for faster requests
-        self.completed_games = 0  # Track how many have finished loading
+        self.pools = pools  # Shared WorkerPools; images hop between the disk, network and decode pools
+        self.scheduler = ImageJobScheduler()  # Decides which cover each worker fetches next
+        self.session = None  # Created in run() so requests is imported off the GUI thread
         self.total_games = 0  # Will be set later
         
         if not os.path.exists(self.cache_dir):
             os.makedirs(self.cache_dir)
 
 
+    def cancel(self):
+        """Marks this load as stale so queued workers drop out before doing any work."""
+        self.cancelled.set()
+
+
+    def is_cancelled(self):
+        """Returns True once this load has been superseded by a newer one."""
+        return self.cancelled.is_set()
+
+
+    def prioritize(self, app_ids):
+        """Fetches covers for these app ids (e.g. the rows on screen) before the rest."""
+        self.scheduler.prioritize(app_ids)
+
+
     def run(self):
         """Loads games and images in a separate thread, checking the cache."""
-        games = self.game_library.get_all_games(self.exclusion_file)
+        threading.current_thread().name = f"loader {self.generation}"  # Labels this thread in traces
+        # Superseded before it even started, e.g. by a burst of reloads
+        if self.is_cancelled():
+            return
+
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self.session = requests.Session()  # Keep a session for faster requests
+
+        # Let every network worker keep its own connection alive
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pools.size("network"))
+        self.session.mount("https://", adapter)
+
+        with span("fetch library", "loader", generation=self.generation):
+            games = self.game_library.get_all_games(self.exclusion_file, self.is_cancelled)
         self.total_games = len(games)
 
+        # A reload may have been requested while the library was being fetched
+        if self.is_cancelled():
+            return
+
         if self.total_games == 0:
-            self.finished_loading.emit()
+            self.finished_loading.emit(self.generation)
             return
 
+        games_by_appid = {game[1]: game for game in games}  # O(1) lookup from worker results
+        self.games_discovered.emit(self.generation, games)
+        self.scheduler.add_games(games)
+
+
+        def emit_batch(batch, completed):
+            """Sends a batch of results and the matching progress to the UI thread."""
+            if self.is_cancelled():
+                return
+            instant("emit batch", "loader", size=len(batch), completed=completed)
+            self.games_loaded.emit(self.generation, batch)
+            self.progress_update.emit(self.generation, int((completed / self.total_games) * 100))
 
-        def image_callback(app_id, pixmap):
-            """Receives the pixmap and emits it for UI updates."""
-            for game in games:
-                if game[1] == app_id:  # Match by app_id
-                    self.game_loaded.emit(game, pixmap)
-                    break
-            
-            # Track completed games and update progress
-            self.completed_games += 1
-            progress = int((self.completed_games / self.total_games) * 100)
-            self.progress_update.emit(progress)
+        batcher = ResultBatcher(self.total_games, emit_batch)
 
-            # If all games are processed, signal completion
-            if self.completed_games >= self.total_games:
-                self.finished_loading.emit()
 
-        for game in games:
-            _, app_id, _, _, _, _, _ = game
+        def image_callback(app_id, image):
+            """Receives the image from a pool thread and queues it for the next batch."""
+            batcher.add(games_by_appid[app_id], image)
+
+        # One worker per game; each asks the scheduler which cover to load when it starts
+        for _ in games:
+            if self.is_cancelled():
+                break
 
             # Load image in parallel
-            worker = ImageLoaderWorker(app_id, self.cache_dir, self.session, image_callback)
-            self.thread_pool.start(worker)
+            worker = ImageLoaderWorker(self.scheduler.next_job, self.cache_dir, self.session, self.pools, image_callback, self.is_cancelled)
+            self.pools.start("disk", worker.run)
+
+        # Emit batches from this thread only, until every image has been processed and sent
+        while True:
+            batcher.wait()
+            if self.is_cancelled():
+                return
+            if batcher.flush():
+                break
+
+        if not self.is_cancelled():
+            self.finished_loading.emit(self.generation)
+
+
+
+class FriendsLoaderThread(QThread):
+    """Fetches the friend list, or the libraries of the given friends, off the GUI thread."""
+    friends_loaded = pyqtSignal(list)  # {"steam_id", "name"} dicts
+    libraries_loaded = pyqtSignal(object)  # steam_id -> app id array, None for private libraries
+    progress_update = pyqtSignal(int, int)  # Libraries fetched so far, libraries requested
+    failed = pyqtSignal(str)
+
+
+    def __init__(self, friend_libraries, friends=None, refresh=False):
+        super().__init__()
+        self.friend_libraries = friend_libraries
+        self.friends = friends  # None fetches the friend list itself
+        self.refresh = refresh
+        self.cancelled = threading.Event()
+
+
+    def cancel(self):
+        self.cancelled.set()
 
-        # Ensure the thread pool doesn't exit until all images are processed
-        self.thread_pool.waitForDone()
+
+    def is_cancelled(self):
+        return self.cancelled.is_set()
+
+
+    def run(self):
+        threading.current_thread().name = "friends loader"
+        try:
+            if self.friends is None:
+                self.friends_loaded.emit(self.friend_libraries.get_friends(self.refresh))
+                return
+
+            libraries = self.friend_libraries.fetch_libraries(self.friends, self.progress_update.emit, self.is_cancelled)
+            if not self.is_cancelled():
+                self.libraries_loaded.emit(libraries)
+        except Exception as e:
+            self.failed.emit(str(e))
+
+
+
+class DiskUsageThread(QThread):
+    """Runs a DiskUsageScanner over the Steam libraries off the GUI thread."""
+    usage_ready = pyqtSignal(object)  # app_id -> {kind: bytes}
+
+
+    def __init__(self, game_library, scanner):
+        super().__init__()
+        self.game_library = game_library
+        self.scanner = scanner
+        self.cancelled = threading.Event()
+
+
+    def cancel(self):
+        self.cancelled.set()
+
+
+    def is_cancelled(self):
+        return self.cancelled.is_set()
+
+
+    def run(self):
+        threading.current_thread().name = "disk usage"
+        usage = self.scanner.scan(self.game_library.get_library_paths(), self.is_cancelled)
+        if not self.is_cancelled():
+            self.usage_ready.emit(usage)
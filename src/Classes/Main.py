@@ -2,53 +2,151 @@ import os
 import sys
 import json
 import random
-from PyQt5.QtCore import Qt
-from PyQt5.QtWidgets import (
-    QMainWindow, QApplication, QWidget, QHBoxLayout, QLabel,
-    QListWidgetItem, QMenu, QAction, QMessageBox, QFileDialog
-)
-
-from Classes.Functions import launch_game, open_link
-from Classes.LoaderThread import GameLoaderThread
-from Classes.Utils.SteamLib import GameLibrary
+import importlib
+from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtGui import QIcon, QPixmap
+from PyQt5.QtWidgets import QMainWindow, QApplication, QLabel, QMenu, QAction, QMessageBox, QFileDialog
+
+from Classes.Functions import open_link
+from Classes.Launcher import GameLauncher
+from Classes.LoaderThread import GameLoaderThread, DiskUsageThread
+from Classes.WorkerPools import WorkerPools
+from Classes.Watchdog import StallWatchdog
+from Classes.ManifestWatcher import ManifestWatcher
+from Classes.Utils.SteamLib import GameLibrary, configured_accounts
 from Classes.Utils.Config import JSONConfig
+from Classes.Utils.SearchIndex import normalize
+from Classes.Utils.Store import GameStore
+from Classes.Utils.Snapshot import save_snapshot, load_snapshot
+from Classes.Utils.DiskUsage import DiskUsageScanner
+from Classes.Utils import Tracing
 from Classes.GUI.MainWindow import Ui_MainWindow
-from Classes.GUI.InfoWindow import GameInfoWindow
-from Classes.GUI.PathDialog import SteamPathDialog
-from Classes.GUI.APIDialog import SteamApiDialog
+from Classes.GUI.GameList import GameListModel, GameItemDelegate
+from Classes.GUI.CoverCache import CoverCache
 
 
 
 class MainWindow(QMainWindow, Ui_MainWindow):
+    DIALOGS = {  # Imported on first use so they don't slow down startup
+        "steam_path": ("Classes.GUI.PathDialog", "SteamPathDialog"),
+        "steam_api": ("Classes.GUI.APIDialog", "SteamApiDialog"),
+        "friends": ("Classes.GUI.FriendsDialog", "FriendsDialog"),
+    }
+
+
     def __init__(self, root_path, parent=None):
         super().__init__(parent)
         self.setupUi(self)
-        self.config = JSONConfig(root_path / 'config.json')
-        self.games, self.filtered_games = [], []
-        self.show_installed_only = False
+        self.config = JSONConfig(root_path / 'config.json', write_behind=True)  # Filter changes are written in batches
+        Tracing.configure(self.config.get_value(1, "trace_file"))  # Or set STEAM_TRACE_FILE
         self.cache_dir = root_path / "Cache"
+        # Game tuples and their indexes, shared with the command line; fuzzy search is a typo tolerant fallback
+        self.store = GameStore(self.cache_dir / "description_index.json", self.config.get_value(1, "fuzzy_search") or False)
+        self.filtered_games = []  # Game tuples in display order
+        self.view_is_sorted = False  # False while loader batches are appended in arrival order
+        self.filter_timer = QTimer(self, singleShot=True, interval=150)  # Waits for a pause in typing before filtering
+        self.scroll_timer = QTimer(self, singleShot=True, interval=100)  # Waits for scrolling to settle before reordering cover loads
+        self.reconciling = False  # True while a refresh runs on top of a restored snapshot
+        self.seen_appids, self.snapshot_stale = set(), False  # What the refresh confirmed or changed
+        self.load_generation = 0  # Bumped on every reload so stale loader signals can be ignored
+        self.loader_thread, self.retired_loaders = None, []
+        self.disk_usage_thread = None
+        self.disk_usage = {}  # app_id -> {kind: bytes} outside the install folder, from the last scan
+        self.pending_message = None  # Forwarded request waiting for games to be loaded
+        self.show_installed_only = False
+        self.friend_appids = None  # App ids shared with the chosen friends; None shows every game
+        self.friend_names = []
+        cover_budget = self.config.get_value(1, "cover_cache_mb")
+        if not cover_budget:
+            cover_budget = 64  # Roughly 1700 thumbnails; written back so it can be tuned
+            self.config.add_entry(1, "cover_cache_mb", cover_budget, "int")
+        self.pixmaps = CoverCache(self.cache_dir / "Games", cover_budget)  # app_id -> cover, reloaded from disk when evicted
+        self.worker_pools = WorkerPools(self.config)
+        self.launcher = GameLauncher(self)  # Hands steam:// URLs to Steam without blocking the UI
+        self.manifest_watcher = ManifestWatcher(parent=self)  # Follows downloads and updates between loads
+
+        # Logs the GUI thread's stack whenever the event loop stops ticking; 0 turns it off
+        stall_threshold = self.config.get_value(1, "stall_threshold_ms")
+        self.watchdog = None
+        if stall_threshold != 0:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            self.watchdog = StallWatchdog(self.cache_dir / "stalls.log", stall_threshold or 500, self)
+            QTimer.singleShot(0, self.watchdog.start)  # Start with the event loop, not during startup
+
+        self.game_model = GameListModel(self.pixmaps, self, self.store.install_states)  # Shared, so rows show live states
+        self.listView.setModel(self.game_model)
+        self.listView.setItemDelegate(GameItemDelegate(self.listView))
+        self.listView.setMouseTracking(True)  # Lets the delegate paint hover highlights
 
         self.status_label = QLabel("Games Loaded: 0")
         self.statusBar.addWidget(self.status_label)
 
+        self.actionPlay_With_Friends = QAction("Play With Friends...", self)
+        self.menuEdit.insertAction(self.menuEdit.actions()[1], self.actionPlay_With_Friends)
+
         self.steam_path, self.api_key, self.steam_id, self.exclusion_file = self.return_config_values()
+        self.restore_snapshot()
         self.check_required_settings()
         self.setup_connections()
+        self.resources_loaded = False  # Icons are applied after the window has been painted once
+
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not self.resources_loaded:
+            self.resources_loaded = True
+            QTimer.singleShot(0, self.load_resources)
+
+
+    def load_resources(self):
+        """Registers the embedded Qt resources and applies the menu icons that use them."""
+        import Classes.GUI.Resources  # Large module of embedded image data, kept off the startup path
+
+        icons = [
+            (self.actionOpen_New_Exclusion_File, ":/Images/folder.png"),
+            (self.actionSave_Open_Exclusion_File, ":/Images/save.png"),
+            (self.actionChoose_Random_Game, ":/Images/random.png"),
+            (self.actionUpdate_Steam_Path, ":/Images/steam.png"),
+            (self.actionUpdate_API_information, ":/Images/steam.png"),
+        ]
+        for action, path in icons:
+            action.setIcon(QIcon(path))
+
+
+    def closeEvent(self, event):
+        """Writes out pending settings before the window goes away."""
+        self.cancel_loading()
+        self.worker_pools.wait_for_done(3000)  # Cancelled covers drop out at once; give downloads in flight their timeout
+        if self.disk_usage_thread:
+            self.retire(self.disk_usage_thread)
+        self.config.flush()
+        if self.watchdog:
+            self.watchdog.stop()
+        self.manifest_watcher.stop()
+        super().closeEvent(event)
 
 
     def setup_connections(self):
         """Connects UI elements to their respective functions."""
+        self.filter_timer.timeout.connect(self.filter_games)
+        self.scroll_timer.timeout.connect(self.prioritize_visible_games)
+
         ui_connections = [
-            (self.filter_lineEdit.textChanged, self.filter_games),
+            (self.filter_lineEdit.textChanged, lambda _: self.filter_timer.start()),
+            (self.listView.verticalScrollBar().valueChanged, lambda _: self.scroll_timer.start()),
             (self.filter_comboBox.currentIndexChanged, self.sort_games),
             (self.filter_checkBox.stateChanged, self.filter_installed_games),
-            (self.listWidget.itemDoubleClicked, lambda item: self.show_game_info(*item.data(1))),
+            (self.listView.doubleClicked, lambda index: self.show_game_info(*index.data(GameListModel.GameRole))),
             (self.random_pushButton.clicked, self.pick_random_game),
             (self.actionOpen_New_Exclusion_File.triggered, lambda: self.handle_exclusion_file("open")),
             (self.actionSave_Open_Exclusion_File.triggered, lambda: self.handle_exclusion_file("save")),
             (self.actionChoose_Random_Game.triggered, self.pick_random_game),
-            (self.actionUpdate_Steam_Path.triggered, lambda: self.show_dialog_prompt(SteamPathDialog)),
-            (self.actionUpdate_API_information.triggered, lambda: self.show_dialog_prompt(SteamApiDialog)),
+            (self.actionPlay_With_Friends.triggered, self.show_friends_dialog),
+            (self.actionUpdate_Steam_Path.triggered, lambda: self.show_dialog_prompt("steam_path")),
+            (self.actionUpdate_API_information.triggered, lambda: self.show_dialog_prompt("steam_api")),
+            (self.launcher.launched, self.on_launched),
+            (self.launcher.launch_failed, self.on_launch_failed),
+            (self.manifest_watcher.states_changed, self.on_install_states_changed),
         ]
 
         # Apply UI element connections
@@ -61,8 +159,8 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         install_filter = self.config.get_value(1, "installed_filter") or False
         self.filter_checkBox.setChecked(install_filter)
 
-        self.listWidget.setContextMenuPolicy(Qt.CustomContextMenu)
-        self.listWidget.customContextMenuRequested.connect(self.show_context_menu)
+        self.listView.setContextMenuPolicy(Qt.CustomContextMenu)
+        self.listView.customContextMenuRequested.connect(self.show_context_menu)
 
 
     def return_config_values(self):
@@ -77,10 +175,10 @@ class MainWindow(QMainWindow, Ui_MainWindow):
     def check_required_settings(self):
         """Ensures all required settings are set before proceeding."""
         if not self.steam_path:
-            self.show_dialog_prompt(SteamPathDialog, centered=True)
+            self.show_dialog_prompt("steam_path", centered=True)
 
         if not self.api_key or not self.steam_id:
-            self.show_dialog_prompt(SteamApiDialog, centered=True, first=True)
+            self.show_dialog_prompt("steam_api", centered=True, first=True)
         else:
             self.load_games_async()
 
@@ -88,8 +186,10 @@ class MainWindow(QMainWindow, Ui_MainWindow):
             self.load_exclusion_contents(self.exclusion_file)
 
 
-    def show_dialog_prompt(self, dialog_class, centered=False, first=False):
+    def show_dialog_prompt(self, dialog_name, centered=False, first=False):
         """Displays a dialog prompt and reloads the game list if needed."""
+        module_name, class_name = self.DIALOGS[dialog_name]
+        dialog_class = getattr(importlib.import_module(module_name), class_name)
         dialog = dialog_class(self, centered, first)
         dialog.exec_()
         if dialog.reload:
@@ -98,85 +198,309 @@ class MainWindow(QMainWindow, Ui_MainWindow):
 
     def update_status_bar(self):
         """Updates the status bar to reflect how many games are currently loaded."""
-        num_games = len(self.filtered_games) if self.filtered_games else len(self.games)
-        self.status_label.setText(f"Games Loaded: {num_games}")
+        num_games = len(self.filtered_games) if self.filtered_games else len(self.store.games)
+        if self.friend_appids is not None:
+            names = self.friend_names[:3] + ([f"{len(self.friend_names) - 3} more"] if len(self.friend_names) > 3 else [])
+            self.status_label.setText(f"Games Loaded: {num_games} (shared with {', '.join(names)})")
+        else:
+            self.status_label.setText(f"Games Loaded: {num_games}")
 
 
     def load_games_async(self):
         """Loads games asynchronously using a separate thread."""
+        self.cancel_loading()
+        self.manifest_watcher.stop()  # Restarted with the new load's manifests
+        self.load_generation += 1
+        self.seen_appids, self.snapshot_stale = set(), False
+
         self.steam_path, self.api_key, self.steam_id, _ = self.return_config_values()
-        self.game_library = GameLibrary(self.steam_path, self.api_key, self.steam_id)
-        self.loader_thread = GameLoaderThread(self.game_library, self.exclusion_file, self.cache_dir)
+        self.game_library = GameLibrary(self.steam_path, self.api_key, self.steam_id, configured_accounts(self.config), self.cache_dir / "Accounts")
+        self.loader_thread = GameLoaderThread(self.game_library, self.exclusion_file, self.cache_dir, self.worker_pools, self.load_generation)
 
-        self.loader_thread.game_loaded.connect(self.add_game_to_list)
+        self.loader_thread.games_discovered.connect(self.on_games_discovered)
+        self.loader_thread.games_loaded.connect(self.add_games_to_list)
         self.loader_thread.finished_loading.connect(self.on_loading_complete)
-        self.loader_thread.progress_update.connect(self.progressBar.setValue)
+        self.loader_thread.progress_update.connect(self.update_progress)
 
         self.loader_thread.start()
 
 
-    def add_game_to_list(self, game, pixmap):
-        """Adds a game to the list and updates the display if it matches the filter."""
-        self.games.append((game, pixmap))
-        if self.is_game_matching_search(game, self.filter_lineEdit.text().lower()):
-            self.add_game_to_display(game, pixmap)
+    def cancel_loading(self):
+        """Cancels the running load, keeping its thread alive until it winds down."""
+        loader = self.loader_thread
+        if loader is None:
+            return
+
+        self.loader_thread = None
+        self.retire(loader)
+
+
+    def retire(self, thread):
+        """Cancels a worker thread, keeping it alive until it winds down."""
+        thread.cancel()
+        if thread.isRunning():
+            # Destroying a running QThread aborts the process, so hold on to it until it exits
+            self.retired_loaders.append(thread)
+            thread.finished.connect(lambda: self.retired_loaders.remove(thread))
+
+
+    def is_current_load(self, generation):
+        """Checks whether a loader signal belongs to the active load."""
+        return generation == self.load_generation
+
+
+    def update_progress(self, generation, value):
+        if not self.is_current_load(generation):
+            return
+
+        self.progressBar.setValue(value)
+        covers = self.pixmaps.stats()
+        self.progressBar.setToolTip("\n".join([
+            f"{name}: {stats['active']}/{stats['size']} active, {stats['queued']} queued"
+            for name, stats in self.worker_pools.stats().items()
+        ] + [f"covers: {covers['covers']} in memory, {covers['used_mb']}/{covers['budget_mb']} MB"]))
+
+
+    @Tracing.traced(category="ui")
+    def on_games_discovered(self, generation, games):
+        """Starts cover loading with the rows already on screen, e.g. those restored from the snapshot."""
+        if not self.is_current_load(generation):
+            return
+
+        self.store.facet_index.account_names = self.game_library.account_names
+        self.prioritize_visible_games()
+
+
+    def prioritize_visible_games(self):
+        """Asks the loader to fetch the covers of the rows in view before the rest."""
+        if self.loader_thread is None:
+            return
+
+        viewport = self.listView.viewport().rect()
+        first = self.listView.indexAt(viewport.topLeft())
+        if not first.isValid():
+            return
+        last = self.listView.indexAt(viewport.bottomLeft())
+        last_row = last.row() if last.isValid() else self.game_model.rowCount() - 1  # The list ends above the bottom edge
+
+        self.loader_thread.prioritize([self.game_model.rows[row][1] for row in range(first.row(), last_row + 1)])
+
+
+    @Tracing.traced(category="ui")
+    def add_games_to_list(self, generation, batch):
+        """Adds a batch of games to the list and displays the ones matching the filter."""
+        if not self.is_current_load(generation):
+            return
+
+        new_games = []
+        for game, image in batch:
+            self.pixmaps[game[1]] = QPixmap.fromImage(image) if image is not None else None  # QPixmaps belong to the GUI thread
+            self.seen_appids.add(game[1])
+            position = self.store.positions.get(game[1])
+            if position is None:
+                new_games.append(game)
+            elif self.store.games[position] != game:
+                # Indexes are rebuilt once the refresh completes
+                self.store.games[position] = game
+                self.snapshot_stale = True
+
+        added = self.store.index_games(new_games, self.game_library.library_folders, self.game_library.owners, self.game_library.workshop)
+
+        if self.reconciling:
+            # Keep the restored rows in place until the refresh is done; only covers change now
+            self.game_model.refresh_covers()
+        else:
+            search_text = normalize(self.store.facet_index.filter_text(self.filter_lineEdit.text())[0])
+            self.game_model.append_games([game for position, game in added if self.store.search_index.matches(position, search_text)])
+            self.view_is_sorted = False
         self.update_status_bar()
 
 
-    def add_game_to_display(self, game, pixmap):
-        """Displays a game item in the UI."""
-        name, installed = game[0], game[5]
-        status_color = "green" if installed else "red"
+    @Tracing.traced(category="ui")
+    def restore_snapshot(self):
+        """Shows the library saved by the previous run straight away; the next load refreshes it."""
+        if not self.steam_path:
+            return
 
-        item_widget = QWidget()
-        layout = QHBoxLayout(item_widget)
-        img_label = QLabel()
+        snapshot = load_snapshot(self.cache_dir / "library.snapshot", (self.steam_path, self.steam_id))
+        if not snapshot:
+            return
 
-        if pixmap:
-            img_label.setPixmap(pixmap)
+        self.store.facet_index.account_names = snapshot["account_names"]
+        self.store.index_games(snapshot["games"], snapshot["library_folders"], snapshot["owners"], snapshot["workshop"])
+        self.filter_checkBox.setEnabled(snapshot["install_filter"])
+        self.reconciling = True
 
-        layout.addWidget(img_label)
-        layout.addWidget(QLabel(name, styleSheet=f"color: {status_color};"))
-        layout.addStretch()
+        # Covers are read from the disk cache as rows are painted; the refresh streams in the rest
+        self.filter_games()
 
-        item = QListWidgetItem()
-        item.setSizeHint(item_widget.sizeHint())
-        item.setData(1, game)
 
-        self.listWidget.addItem(item)
-        self.listWidget.setItemWidget(item, item_widget)
+    @Tracing.traced(category="ui")
+    def write_snapshot(self):
+        try:
+            save_snapshot(
+                self.cache_dir / "library.snapshot", self.store.games, self.game_library.library_folders,
+                self.game_library.install_filter, (self.steam_path, self.steam_id),
+                self.game_library.owners, self.game_library.account_names, self.game_library.workshop,
+            )
+        except Exception as e:
+            print(f"Error saving library snapshot: {e}")
 
 
-    def on_loading_complete(self):
+    @Tracing.traced(category="ui")
+    def on_loading_complete(self, generation):
         """Handles UI updates once game loading is complete."""
+        if not self.is_current_load(generation):
+            return
+
+        if self.reconciling:
+            # Apply what the refresh found: drop games that disappeared, reindex if anything changed
+            self.reconciling = False
+            removed = set(self.store.positions) - self.seen_appids
+            owners = {app_id: mask for app_id, mask in self.game_library.owners.items() if app_id in self.store.positions}
+            workshop = {app_id: entry for app_id, entry in self.game_library.workshop.items() if app_id in self.store.positions}
+            if removed or self.snapshot_stale or owners != self.store.owners or workshop != self.store.workshop:
+                games = [game for game in self.store.games if game[1] not in removed]
+                self.store.clear()
+                self.store.index_games(games, self.game_library.library_folders, self.game_library.owners, self.game_library.workshop)
+
+        self.store.apply_install_states(self.game_library.install_states)
+        self.manifest_watcher.watch(self.game_library.manifests, self.game_library.install_states)
         self.filter_games()
-        self.sort_games()
         self.filter_checkBox.setEnabled(self.game_library.install_filter)
+        self.write_snapshot()
+        self.scan_disk_usage()
+
+        # List the available facet terms so they can be discovered from the search box
+        counts = self.store.facet_index.counts()
+        self.filter_lineEdit.setToolTip("Filter terms (prefix with - to exclude):\n" + "\n".join(
+            f"{facet} ({count})" for facet, count in sorted(counts.items())
+        ))
+
+        if self.pending_message:
+            message, self.pending_message = self.pending_message, None
+            self.handle_instance_message(message)
+
+
+    def on_install_states_changed(self, changes):
+        """Shows download and update progress reported by the manifest watcher."""
+        self.store.apply_install_states(changes)
+        self.game_model.refresh_status(changes)
+
+        progress = [f"{self.game_name(app_id)}: {self.game_model.status_text(app_id)}" for app_id in changes if self.game_model.status_text(app_id)]
+        if progress:
+            self.statusBar.showMessage(", ".join(progress), 5000)
+        if "state:" in self.filter_lineEdit.text():
+            self.filter_games()
+
+
+    def scan_disk_usage(self):
+        """Measures Proton prefixes, shader caches and workshop content in the background."""
+        if self.disk_usage_thread:
+            self.retire(self.disk_usage_thread)
+
+        scanner = DiskUsageScanner(self.cache_dir / "disk_usage.cache")
+        self.disk_usage_thread = DiskUsageThread(self.game_library, scanner)
+        self.disk_usage_thread.usage_ready.connect(self.on_disk_usage)
+        self.disk_usage_thread.start()
+
+
+    @Tracing.traced(category="ui")
+    def on_disk_usage(self, usage):
+        self.disk_usage = usage
+        self.store.set_disk_usage(usage)
+        if self.get_sort_order()[0] == "disk_usage":
+            self.view_is_sorted = False
+            self.filter_games()
+
+
+    def handle_instance_message(self, message):
+        """Brings the window forward and applies a request from the command line or a later launch."""
+        self.setWindowState(self.windowState() & ~Qt.WindowMinimized)
+        self.show()
+        self.raise_()
+        self.activateWindow()
+
+        if message.get("search") is not None:
+            self.filter_lineEdit.setText(str(message["search"]))
+            self.filter_games()  # Now, rather than after the typing delay
+
+        # Both need games; if nothing is loaded yet, try again when the load completes
+        if (message.get("show") or message.get("random")) and not self.store.games:
+            self.pending_message = {key: message[key] for key in ("show", "random") if key in message}
+            return
+
+        if message.get("show"):
+            position = self.store.positions.get(str(message["show"]))
+            if position is not None:
+                self.show_game_info(*self.store.games[position])
+            else:
+                self.statusBar.showMessage(f"App {message['show']} is not in the library", 5000)
+
+        if message.get("random"):
+            self.pick_random_game()
+
+
+    def show_friends_dialog(self):
+        if not self.api_key or not self.steam_id or not hasattr(self, "game_library"):
+            self.statusBar.showMessage("Playing with friends needs a Steam API key and profile id", 5000)
+            return
+        self.show_dialog_prompt("friends")
+
+
+    def set_friend_filter(self, appids, names=(), hidden=()):
+        """Limits the list (and so the random pick) to appids, or shows every game again when None."""
+        self.friend_appids, self.friend_names = appids, list(names)
+        if hidden:
+            self.statusBar.showMessage(f"Libraries not visible, left out: {', '.join(hidden)}", 8000)
+        self.filter_games()
 
 
     def pick_random_game(self):
         """Selects and displays a random game from the filtered list."""
         if self.filtered_games:
-            self.show_game_info(*random.choice(self.filtered_games)[0])
+            self.show_game_info(*random.choice(self.filtered_games))
 
 
     def show_game_info(self, game_name, app_id, last_played, last_updated, size_on_disk, installed, playtime):
         """Displays the game information window."""
-        description = self.game_library.get_game_description(app_id)
+        from Classes.GUI.InfoWindow import GameInfoWindow  # Deferred until a game is first opened
+
+        cached = self.store.description_index.get(app_id)
+        if cached:
+            description = cached[0]
+        else:
+            # Keep what the store returns so it can be searched later
+            description, genres, found = self.game_library.get_game_details(app_id)
+            if found:
+                self.store.add_description(app_id, description, genres)
+
         info_window = GameInfoWindow(game_name, app_id, last_played, last_updated, size_on_disk, installed, playtime, description, self.steam_path, self)
         info_window.setAttribute(Qt.WA_DeleteOnClose)
         info_window.show()
 
 
+    @Tracing.traced(category="ui")
     def filter_games(self):
         """Filters the game list based on the search input."""
-        search_text = self.filter_lineEdit.text().lower()
-        self.filtered_games = [
-            (game, pixmap) for game, pixmap in self.games
-            if self.is_game_matching_search(game, search_text) and (not self.show_installed_only or game[5])
-        ]
-        self.sort_games()
+        self.filter_timer.stop()
+
+        # Walk the presorted permutation, keeping the games that match the search, checkbox and friends
+        criterion, reverse_order = self.get_sort_order()
+        self.filtered_games = self.store.query(
+            self.filter_lineEdit.text(), sort=criterion, reverse=reverse_order,
+            installed_only=self.show_installed_only, app_ids=self.friend_appids,
+        )
+
+        if self.view_is_sorted:
+            # Same order as what's on screen, so only hide/show the rows that changed
+            self.game_model.update_rows(self.filtered_games)
+        else:
+            self.game_model.set_games(self.filtered_games)
+            self.view_is_sorted = True
+
         self.update_status_bar()
+        self.prioritize_visible_games()
 
 
     def filter_installed_games(self):
@@ -185,54 +509,47 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         self.filter_games()
 
 
-    def is_game_matching_search(self, game, search_text):
-        """Checks if a game matches the search criteria."""
-        return search_text in game[0].lower() or search_text in str(game[1])
+    def get_sort_order(self):
+        """Returns the SortIndex criterion and direction for the selected sort."""
+        return {
+            "Alphabetical": ("name", False),  # Sort by name (case and accent insensitive)
+            "Last Played": ("last_played", True),  # Sort by last played date, newest first
+            "Last Updated": ("last_updated", True),  # Sort by last updated date, newest first
+            "Size on Disk": ("size", True),  # Sort by size on disk, largest first
+            "Total Disk Usage": ("disk_usage", True),  # Install plus Proton prefix, shader cache and workshop content
+            "Workshop Size": ("workshop_size", True),  # Installed workshop content, largest first
+            "Playtime High to Low": ("playtime", True),  # Sort by playtime forever, high to low
+            "Playtime Low to High": ("playtime", False),  # Sort by playtime forever, low to high
+        }.get(self.filter_comboBox.currentText(), ("name", False))
 
 
     def sort_games(self):
         """Sorts games based on the selected criteria."""
         self.config.add_entry(1, 'last_used_filter', self.filter_comboBox.currentText(), "str")
 
-        sort_key = {
-            "Alphabetical": lambda x: x[0][0].lower(),  # Sort by name (case-insensitive)
-            "Last Played": lambda x: x[0][2],  # Sort by last played date
-            "Last Updated": lambda x: x[0][3],  # Sort by last updated date
-            "Size on Disk": lambda x: x[0][4],  # Sort by size on disk
-            "Playtime High to Low": lambda x: int(x[0][6]),  # Sort by playtime forever, high to low (ensure int)
-            "Playtime Low to High": lambda x: int(x[0][6]),  # Sort by playtime forever, low to high (ensure int)
-        }.get(self.filter_comboBox.currentText())
-
-        if sort_key:
-            # If the sorting is for 'Playtime High to Low', we want reverse (highest first)
-            reverse_order = self.filter_comboBox.currentText() in ["Last Played", "Last Updated", "Size on Disk", "Playtime High to Low"]
-            
-            # Sorting the games based on the selected criteria
-            self.filtered_games.sort(key=sort_key, reverse=reverse_order)
-
-        self.listWidget.clear()
-        for game, pixmap in self.filtered_games:
-            self.add_game_to_display(game, pixmap)
+        # The order changes, so the view is rebuilt instead of diffed
+        self.view_is_sorted = False
+        self.filter_games()
 
 
     def show_context_menu(self, pos):
-        item = self.listWidget.itemAt(pos)
-        if not item:
+        index = self.listView.indexAt(pos)
+        if not index.isValid():
             return
         
-        game = item.data(1)
+        game = index.data(GameListModel.GameRole)
         game_name, app_id, _, _, _, installed, _ = game  # Extract 'installed' status
 
         menu = QMenu(self)
 
         actions = [
-            ("Launch", lambda: launch_game(self.steam_path, app_id, "launch"), installed),
+            ("Launch", lambda: self.launch_game(app_id, "launch"), installed),
             (None, None, None),  # Separator
             ("Show Info", lambda: self.show_game_info(*game), True),
             ("Copy App ID", lambda: self.copy_to_clipboard(game_name, app_id), True),
             ("Add to Exclusion List", lambda: self.add_to_exclusion_list(game_name, app_id), True),
             (None, None, None),  # Separator
-            ("Open Store Page", lambda: launch_game(self.steam_path, app_id, "store"), True),
+            ("Open Store Page", lambda: self.launch_game(app_id, "store"), True),
             ("Open SteamDB Page", lambda: open_link(2, app_id), True),
         ]
 
@@ -245,7 +562,27 @@ class MainWindow(QMainWindow, Ui_MainWindow):
                 action.setEnabled(enabled)
                 menu.addAction(action)
 
-        menu.exec_(self.listWidget.viewport().mapToGlobal(pos))
+        menu.exec_(self.listView.viewport().mapToGlobal(pos))
+
+
+    def launch_game(self, app_id, mode):
+        """Starts a game or opens its store page; the result arrives via on_launched/on_launch_failed."""
+        self.statusBar.showMessage(f"{'Launching' if mode == 'launch' else 'Opening store page for'} {self.game_name(app_id)}...", 5000)
+        self.launcher.launch(self.steam_path, app_id, mode)
+
+
+    def on_launched(self, app_id, mode):
+        self.statusBar.showMessage(f"{'Launched' if mode == 'launch' else 'Opened store page for'} {self.game_name(app_id)}", 5000)
+
+
+    def on_launch_failed(self, app_id, mode, error):
+        self.statusBar.clearMessage()
+        QMessageBox.warning(self, "Launch Failed", f"Failed to {'launch' if mode == 'launch' else 'open the store page for'} {self.game_name(app_id)}: {error}")
+
+
+    def game_name(self, app_id):
+        position = self.store.positions.get(app_id)
+        return self.store.games[position][0] if position is not None else f"app {app_id}"
 
 
     def copy_to_clipboard(self, game_name, app_id):
@@ -256,9 +593,13 @@ class MainWindow(QMainWindow, Ui_MainWindow):
 
     def reload_game_list(self):
         """Clears and reloads the game list."""
-        self.listWidget.clear()
-        self.games.clear()
+        self.game_model.clear()
+        self.store.clear()
+        self.pixmaps.clear()
+        self.reconciling = False
+        self.view_is_sorted = False
         self.filtered_games.clear()
+        self.progressBar.setValue(0)
         self.load_games_async()
 
 
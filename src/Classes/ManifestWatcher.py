@@ -0,0 +1,133 @@
+import os
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+from Classes.Utils.SteamLib import read_install_state
+
+
+
+class ManifestWatcher(QObject):
+    """Keeps install states live by re-reading app manifests whose mtime changed.
+
+    Manifests of games that are moving bytes are stat'ed every tick. The rest take turns,
+    IDLE_CHECKS per tick, and each steamapps folder is stat'ed as well. When a folder's mtime
+    changes, it is listed and every manifest in it is checked against its listed mtime, so
+    new, removed and rewritten manifests there show up on that tick. An idle library
+    costs a handful of stat calls per second.
+    """
+    states_changed = pyqtSignal(dict)  # app_id -> install state, or None once its manifest is gone
+    ACTIVE = {"downloading", "paused", "staging"}
+    IDLE_CHECKS = 4
+
+
+    def __init__(self, interval_ms=1000, parent=None):
+        super().__init__(parent)
+        self.manifests = {}  # app_id -> [manifest path, mtime_ns when last read]
+        self.states = {}  # app_id -> install state
+        self.folders = {}  # steamapps folder -> mtime_ns
+        self.rotation = []  # Idle app ids still waiting for their turn this round
+        self.timer = QTimer(self, interval=interval_ms)
+        self.timer.timeout.connect(self.check)
+
+
+    def watch(self, manifests, states):
+        """Starts over with the (path, mtime) manifests and install states of a finished load."""
+        self.manifests = {app_id: list(entry) for app_id, entry in manifests.items()}
+        self.states = dict(states)
+        self.folders = {}
+        for path, _ in self.manifests.values():
+            folder = os.path.dirname(path)
+            if folder not in self.folders:
+                self.folders[folder] = self.mtime(folder)
+        self.rotation = []
+        self.timer.start()
+
+
+    def stop(self):
+        self.timer.stop()
+
+
+    def check(self):
+        active = [app_id for app_id, state in self.states.items() if state[0] in self.ACTIVE and app_id in self.manifests]
+        if not self.rotation:
+            self.rotation = [app_id for app_id in self.manifests if app_id not in active]
+        idle = [self.rotation.pop() for _ in range(min(self.IDLE_CHECKS, len(self.rotation)))]
+
+        changed = {}
+        for app_id in active + idle:
+            entry = self.manifests.get(app_id)
+            if entry is None:
+                continue
+            mtime = self.mtime(entry[0])
+            if mtime is None:
+                # Uninstalled; the manifest is deleted
+                del self.manifests[app_id]
+                self.states.pop(app_id, None)
+                changed[app_id] = None
+            elif mtime != entry[1]:
+                entry[1] = mtime
+                self.reread(app_id, changed)
+
+        for folder, mtime in self.folders.items():
+            current = self.mtime(folder)
+            if current is not None and current != mtime:
+                self.folders[folder] = current
+                self.scan_folder(folder, changed)
+
+        if changed:
+            self.states_changed.emit(changed)
+
+
+    def scan_folder(self, folder, changed):
+        """Re-reads the manifests in folder that were created, rewritten or deleted since the last look.
+
+        Each manifest's mtime comes from its directory entry (free on Windows, one cached stat elsewhere).
+        """
+        listed = set()
+        try:
+            with os.scandir(folder) as entries:
+                for entry in entries:
+                    name = entry.name
+                    if not (name.startswith("appmanifest_") and name.endswith(".acf")):
+                        continue
+                    app_id = name[len("appmanifest_"):-len(".acf")]
+                    try:
+                        mtime = entry.stat().st_mtime_ns
+                    except OSError:
+                        continue  # Deleted while we were listing
+                    listed.add(app_id)
+                    known = self.manifests.get(app_id)
+                    if known is None:
+                        # A newly queued install
+                        self.manifests[app_id] = [entry.path, mtime]
+                        self.reread(app_id, changed)
+                    elif known[0] == entry.path and known[1] != mtime:
+                        known[1] = mtime
+                        self.reread(app_id, changed)
+        except OSError as e:
+            print(f"Error listing {folder}: {e}")
+            return
+
+        # Manifests that are no longer listed were uninstalled
+        for app_id, (path, _) in list(self.manifests.items()):
+            if app_id not in listed and os.path.dirname(path) == folder:
+                del self.manifests[app_id]
+                self.states.pop(app_id, None)
+                changed[app_id] = None
+
+
+    def reread(self, app_id, changed):
+        try:
+            state = read_install_state(self.manifests[app_id][0])
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"Error reading manifest for {app_id}: {e}")  # Possibly caught mid-write; the next change retries
+            return
+        if state != self.states.get(app_id):
+            self.states[app_id] = state
+            changed[app_id] = state
+
+
+    @staticmethod
+    def mtime(path):
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return None
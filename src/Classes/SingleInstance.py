@@ -0,0 +1,94 @@
+import sys
+import json
+import hashlib
+from PyQt5.QtCore import QObject, pyqtSignal
+from PyQt5.QtNetwork import QLocalServer, QLocalSocket, QAbstractSocket
+
+
+
+class SingleInstance(QObject):
+    """Local socket that lets later launches hand their request to the window already open.
+
+    The server name is derived from the app folder, so separate installs don't talk to
+    each other. Messages are one JSON object per line.
+    """
+    message_received = pyqtSignal(dict)
+
+
+    def __init__(self, app_root, parent=None):
+        super().__init__(parent)
+        digest = hashlib.sha1(str(app_root).encode("utf-8")).hexdigest()[:12]
+        self.server_name = f"steam-game-picker-{digest}"
+        self.server = None
+
+
+    def send(self, message, timeout_ms=500):
+        """Delivers message to a running instance; False if there is none to deliver it to."""
+        socket = QLocalSocket()
+        socket.connectToServer(self.server_name)
+        if not socket.waitForConnected(timeout_ms):
+            return False
+
+        socket.write((json.dumps(message) + "\n").encode("utf-8"))
+        delivered = socket.waitForBytesWritten(timeout_ms)
+        socket.disconnectFromServer()
+        return delivered
+
+
+    def start(self, message):
+        """Hands message to the running instance, or becomes that instance if there is none.
+
+        Returns True when message was delivered, so this launch can exit.
+        """
+        if self.send(message):
+            return True
+        if self.listen():
+            return False
+
+        if self.server.serverError() == QAbstractSocket.AddressInUseError:
+            # Either a launch racing this one got there first, or a crashed instance left its socket behind
+            if self.send(message):
+                return True
+            QLocalServer.removeServer(self.server_name)
+            if self.listen():
+                return False
+        print(f"Single instance server unavailable: {self.server.errorString()}")
+        return False
+
+
+    def listen(self):
+        """Becomes the instance others forward to; False if the name can't be taken."""
+        self.server = QLocalServer(self)
+        if sys.platform.startswith("win"):
+            # On Unix socket options make Qt rename a new socket over a live one instead of
+            # failing with AddressInUseError; the umask already keeps other users out there
+            self.server.setSocketOptions(QLocalServer.UserAccessOption)
+        if not self.server.listen(self.server_name):
+            return False
+        self.server.newConnection.connect(self.accept)
+        return True
+
+
+    def accept(self):
+        while self.server.hasPendingConnections():
+            socket = self.server.nextPendingConnection()
+            buffer = bytearray()
+
+
+            def read(socket=socket, buffer=buffer):
+                buffer.extend(bytes(socket.readAll()))
+                while b"\n" in buffer:
+                    line, _, rest = bytes(buffer).partition(b"\n")
+                    buffer[:] = rest
+                    try:
+                        message = json.loads(line)
+                    except ValueError:
+                        print(f"Ignoring malformed instance message: {line[:200]!r}")
+                        continue
+                    if isinstance(message, dict):
+                        self.message_received.emit(message)
+
+            socket.readyRead.connect(read)
+            socket.disconnected.connect(socket.deleteLater)
+            if socket.bytesAvailable():
+                read()
@@ -0,0 +1,87 @@
+import sys
+import time
+import builtins
+import threading
+
+
+
+class StartupProfiler:
+    """Records import times and startup milestones for --profile-startup.
+
+    Imports are timed by wrapping builtins.__import__ on the main thread. Each module
+    gets an inclusive time and a self time that excludes the modules it pulled in.
+    """
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.marks = []  # (label, seconds since start)
+        self.imports = []  # (module, inclusive seconds, self seconds)
+        self.child_time = []  # Time spent in nested imports, one entry per import in progress
+        self.original_import = None
+        self.paint_filter = None
+
+
+    def mark(self, label):
+        self.marks.append((label, time.perf_counter() - self.start))
+
+
+    def track_imports(self):
+        """Starts timing every module imported for the first time."""
+        self.original_import = builtins.__import__
+        builtins.__import__ = self._timed_import
+
+
+    def stop_tracking(self):
+        if self.original_import is not None and builtins.__import__ == self._timed_import:
+            builtins.__import__ = self.original_import
+
+
+    def watch_first_paint(self, app):
+        """Marks the first paint event the application delivers, then prints the report."""
+        from PyQt5.QtCore import QObject, QEvent
+
+        profiler = self
+
+
+        class FirstPaintFilter(QObject):
+            def eventFilter(self, obj, event):
+                if event.type() == QEvent.Paint:
+                    app.removeEventFilter(self)
+                    profiler.mark("first paint")
+                    profiler.stop_tracking()
+                    profiler.report()
+                return False
+
+        self.paint_filter = FirstPaintFilter()  # Keep a reference so the filter isn't collected
+        app.installEventFilter(self.paint_filter)
+
+
+    def report(self, top=20, file=sys.stderr):
+        """Prints the milestones and the imports that took the most time of their own."""
+        print("Startup profile", file=file)
+        previous = 0.0
+        for label, elapsed in self.marks:
+            print(f"  {elapsed * 1000:8.1f} ms  (+{(elapsed - previous) * 1000:7.1f})  {label}", file=file)
+            previous = elapsed
+
+        total = sum(self_time for _, _, self_time in self.imports)
+        print(f"Imports: {len(self.imports)} modules, {total * 1000:.1f} ms", file=file)
+        print(f"  {'self':>8}     {'total':>8}", file=file)
+        for module, inclusive, self_time in sorted(self.imports, key=lambda item: item[2], reverse=True)[:top]:
+            print(f"  {self_time * 1000:8.1f} ms  {inclusive * 1000:8.1f} ms  {module}", file=file)
+
+
+    def _timed_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        # Relative, repeated and background-thread imports are passed straight through
+        if level or name in sys.modules or threading.current_thread() is not threading.main_thread():
+            return self.original_import(name, globals, locals, fromlist, level)
+
+        self.child_time.append(0.0)
+        started = time.perf_counter()
+        try:
+            return self.original_import(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - started
+            children = self.child_time.pop()
+            if self.child_time:
+                self.child_time[-1] += elapsed
+            self.imports.append((name, elapsed, elapsed - children))
@@ -1,26 +1,95 @@
 import os
+import sys
+import copy
 import json
+import atexit
+import tempfile
+import threading
+from contextlib import contextmanager
+
+if sys.platform.startswith("win"):
+    import msvcrt
+else:
+    import fcntl
+
+
+_REMOVED = object()  # Marks a pending removal in the dirty set
+
+
+
+@contextmanager
+def atomic_write(path, mode='w', **kwargs):
+    """Opens a uniquely named temporary file next to path and renames it over path if the block succeeds.
+
+    Each writer gets its own temporary file, so concurrent writers (a superseded loader, the
+    CLI next to the GUI) can't interleave their output or remove each other's file.
+    """
+    directory = os.path.dirname(os.fspath(path)) or "."
+    os.makedirs(directory, exist_ok=True)
+    handle, temp_file = tempfile.mkstemp(dir=directory, prefix=f"{os.path.basename(path)}.", suffix=".tmp")
+    try:
+        with os.fdopen(handle, mode, **kwargs) as file:
+            yield file
+        os.chmod(temp_file, 0o644)  # mkstemp creates the file private to its owner
+        os.replace(temp_file, path)
+    except BaseException:
+        try:
+            os.unlink(temp_file)
+        except OSError:
+            pass
+        raise
+
+
+@contextmanager
+def file_lock(lock_path):
+    """Holds an exclusive OS-level lock on lock_path so other instances wait their turn."""
+    with open(lock_path, 'a+') as lock_file:
+        if sys.platform.startswith("win"):
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+        else:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if sys.platform.startswith("win"):
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
 
 
 
 class JSONConfig:
-    def __init__(self, config_file):
+    def __init__(self, config_file, write_behind=False, flush_delay=2.0):
         self.config_file = config_file
+        self.lock_path = f"{config_file}.lock"
+        self.write_behind = write_behind  # Coalesce writes and flush them on a timer and at exit
+        self.flush_delay = flush_delay
+        self.mutex = threading.RLock()
+        self.dirty = {}  # (guild_id, key_name) -> new value or _REMOVED
+        self.timer = None
         self.config = self._load_config()
 
+        if write_behind:
+            atexit.register(self.flush)
+
 
     def _load_config(self):
-        if not os.path.exists(self.config_file):
-            self._create_default_config()
+        with file_lock(self.lock_path):
+            if not os.path.exists(self.config_file):
+                self._create_default_config()
+            return self._read_config()
+
+
+    def _read_config(self):
         with open(self.config_file) as file:
-            config = json.load(file)
-        return config
+            return json.load(file)
 
 
     def _create_default_config(self):
         default_config = {}
-        with open(self.config_file, 'w') as file:
-            json.dump(default_config, file, indent=4)
+        self._write_atomic(default_config)
 
 
     def get_value(self, guild_id, key_name):
@@ -31,9 +100,6 @@ class JSONConfig:
 
 
     def add_entry(self, guild_id, key_name, value, value_type):
-        if not str(guild_id) in self.config:
-            self.config[str(guild_id)] = {}
-
         type_map = {
             "str": str,
             "int": int,
@@ -47,17 +113,71 @@ class JSONConfig:
             raise ValueError("Invalid value type. Supported types are 'str', 'int', 'float', 'bool', and 'dict'.")
 
         conversion_func = type_map[value_type]
-        self.config[str(guild_id)][key_name] = conversion_func(value)
-        self._save_config()
+        value = conversion_func(value)
 
+        with self.mutex:
+            section = self.config.setdefault(str(guild_id), {})
+            if key_name in section and section[key_name] == value:
+                return  # Nothing changed, so don't touch the disk
 
-    def remove_entry(self, guild_id, key_name):
-        if str(guild_id) in self.config:
-            if key_name in self.config[str(guild_id)]:
-                del self.config[str(guild_id)][key_name]
-                self._save_config()
+            section[key_name] = value
+            self.dirty[(str(guild_id), key_name)] = value
+        self._schedule_save()
 
 
-    def _save_config(self):
-        with open(self.config_file, 'w') as file:
-            json.dump(self.config, file, indent=4)
+    def remove_entry(self, guild_id, key_name):
+        with self.mutex:
+            if str(guild_id) in self.config:
+                if key_name in self.config[str(guild_id)]:
+                    del self.config[str(guild_id)][key_name]
+                    self.dirty[(str(guild_id), key_name)] = _REMOVED
+                    self._schedule_save()
+
+
+    def flush(self):
+        """Writes pending changes now. Other instances' edits to keys we didn't change are kept."""
+        with self.mutex:
+            if self.timer is not None:
+                self.timer.cancel()
+                self.timer = None
+            if not self.dirty:
+                return
+
+            with file_lock(self.lock_path):
+                try:
+                    merged = self._read_config()
+                except (OSError, ValueError):
+                    # Missing or corrupt on disk; rewrite everything we know rather than just our changes
+                    merged = copy.deepcopy(self.config)
+
+                for (guild_id, key_name), value in self.dirty.items():
+                    section = merged.setdefault(guild_id, {})
+                    if value is _REMOVED:
+                        section.pop(key_name, None)
+                    else:
+                        section[key_name] = value
+
+                self._write_atomic(merged)
+
+            self.config = merged
+            self.dirty.clear()
+
+
+    def _schedule_save(self):
+        if not self.write_behind:
+            self.flush()
+            return
+
+        with self.mutex:
+            if self.timer is None:
+                self.timer = threading.Timer(self.flush_delay, self.flush)
+                self.timer.daemon = True
+                self.timer.start()
+
+
+    def _write_atomic(self, config):
+        """Writes to a temporary file and renames it over the config, so a crash can't truncate it."""
+        with atomic_write(self.config_file) as file:
+            json.dump(config, file, indent=4)
+            file.flush()
+            os.fsync(file.fileno())
@@ -0,0 +1,134 @@
+import os
+import zlib
+import marshal
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from Classes.Utils.Tracing import span
+from Classes.Utils.Config import atomic_write
+
+
+
+CACHE_MAGIC = b"STDU1\n"  # Bump when the layout changes so old files are ignored
+FOLDERS = {  # Kind -> folder under steamapps holding one <appid> directory per game
+    "compatdata": "compatdata",  # Proton prefixes
+    "shadercache": "shadercache",
+    "workshop": os.path.join("workshop", "content"),
+}
+
+
+def disk_bytes(stat):
+    """Space a file actually takes up; falls back to its size where block counts aren't reported."""
+    blocks = getattr(stat, "st_blocks", None)
+    return blocks * 512 if blocks is not None else stat.st_size
+
+
+
+class DiskUsageScanner:
+    """Measures what games use outside their install folder: Proton prefixes, shader caches and workshop content.
+
+    Each directory's file total is cached along with its mtime, so a repeated scan only lists
+    directories whose entries changed. Files rewritten in place keep their cached size until
+    something is added to or removed from their directory.
+    """
+    def __init__(self, cache_file, workers=8):
+        self.cache_file = cache_file
+        self.workers = workers
+        self.cache = None  # directory -> (mtime_ns, bytes of its files, subdirectory names); read by scan()
+        self.visited = {}  # The same, for the directories seen by the running scan
+
+
+    def scan(self, library_paths, is_cancelled=None):
+        """Returns app_id -> {kind: bytes} for every game with data in one of the FOLDERS."""
+        if self.cache is None:
+            self.cache = self.load_cache()
+
+        jobs = []
+        for library in library_paths:
+            for kind, folder in FOLDERS.items():
+                try:
+                    with os.scandir(os.path.join(library, "steamapps", folder)) as entries:
+                        jobs += [(entry.name, kind, entry.path) for entry in entries if entry.name.isdigit() and entry.is_dir(follow_symlinks=False)]
+                except OSError:
+                    continue  # Not every library has every folder
+
+        usage = defaultdict(lambda: dict.fromkeys(FOLDERS, 0))
+        self.visited = {}
+        with span("disk usage scan", "disk", directories=len(jobs)):
+            with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="disk usage") as executor:
+                sizes = executor.map(lambda job: self.directory_size(job[2], is_cancelled), jobs)
+                for (app_id, kind, _), size in zip(jobs, sizes):
+                    usage[app_id][kind] += size
+
+        if is_cancelled and is_cancelled():
+            return {}
+
+        # Directories that weren't visited are gone, so they drop out of the cache
+        self.cache = self.visited
+        self.save_cache()
+        return dict(usage)
+
+
+    def directory_size(self, path, is_cancelled=None):
+        """Bytes used below path, reusing the cached totals of directories whose mtime hasn't changed."""
+        total, stack = 0, [path]
+        while stack:
+            if is_cancelled and is_cancelled():
+                return total
+
+            directory = stack.pop()
+            try:
+                mtime = os.stat(directory).st_mtime_ns
+            except OSError:
+                continue
+
+            cached = self.cache.get(directory)
+            if cached and cached[0] == mtime:
+                entry = cached
+            else:
+                entry = self.list_directory(directory, mtime)
+                if entry is None:
+                    continue
+
+            self.visited[directory] = entry  # Each directory belongs to one job, so threads never share a key
+            total += entry[1]
+            stack.extend(os.path.join(directory, name) for name in entry[2])
+        return total
+
+
+    def list_directory(self, directory, mtime):
+        files, subdirs = 0, []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.name)
+                        elif entry.is_file(follow_symlinks=False):
+                            files += disk_bytes(entry.stat(follow_symlinks=False))
+                    except OSError:
+                        continue  # Removed while we were listing
+        except OSError:
+            return None
+        return (mtime, files, tuple(subdirs))
+
+
+    def load_cache(self):
+        try:
+            with open(self.cache_file, 'rb') as file:
+                data = file.read()
+            if data.startswith(CACHE_MAGIC):
+                return marshal.loads(zlib.decompress(data[len(CACHE_MAGIC):]))
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Error loading disk usage cache {self.cache_file}: {e}")
+        return {}
+
+
+    def save_cache(self):
+        try:
+            with atomic_write(self.cache_file, 'wb') as file:
+                file.write(CACHE_MAGIC)
+                file.write(zlib.compress(marshal.dumps(self.cache), 1))
+        except OSError as e:
+            print(f"Error saving disk usage cache {self.cache_file}: {e}")
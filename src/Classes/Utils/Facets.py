@@ -0,0 +1,198 @@
+import time
+from collections import defaultdict
+from Classes.Utils.SearchIndex import normalize
+
+
+
+DAY = 24 * 60 * 60
+GB = 1024 ** 3
+FLAG_TABLE = bytes.maketrans(b"01", b"\x00\x01")
+
+
+def bucket(value, bounds):
+    """Returns the label of the first (limit, label) pair whose limit is above value."""
+    for limit, label in bounds:
+        if value < limit:
+            return label
+    return bounds[-1][1]
+
+
+def mask_to_flags(mask, size):
+    """Expands a bitset into one 0/1 byte per position, the form SortIndex.order walks."""
+    bits = bin(mask)[:1:-1][:size]  # Least significant bit first
+    return bytearray(bits, "ascii").translate(FLAG_TABLE).ljust(size, b"\x00")
+
+
+def and_flags(first, second):
+    """Bytewise AND of two equally sized 0/1 flag arrays, done on big ints instead of in a loop."""
+    combined = int.from_bytes(first, "little") & int.from_bytes(second, "little")
+    return bytearray(combined.to_bytes(len(first), "little"))
+
+
+
+class FacetIndex:
+    """One bitset per facet value, so any AND/OR/NOT combination is a handful of int operations.
+
+    Facets are "key:value" strings, e.g. "is:installed", "playtime:10-100h" or "genre:indie".
+    Bit n of every bitset refers to position n in the main window's game list.
+    """
+    PLAYTIME_BUCKETS = [(1, "none"), (60, "<1h"), (600, "1-10h"), (6000, "10-100h"), (float("inf"), "100h+")]
+    SIZE_BUCKETS = [(GB, "<1gb"), (10 * GB, "1-10gb"), (50 * GB, "10-50gb"), (float("inf"), "50gb+")]
+    AGE_BUCKETS = [(7 * DAY, "week"), (30 * DAY, "month"), (365 * DAY, "year"), (float("inf"), "older")]
+    KEYS = {"is", "playtime", "size", "played", "library", "genre", "owner", "workshop", "state"}
+
+
+    def __init__(self):
+        self.bitsets = defaultdict(int)  # facet -> bitset of positions
+        self.size = 0
+        self.account_names = ["me"]  # Bit n of an owner mask belongs to account_names[n]
+
+
+    def add_many(self, items, library_folders=None, genres=None, owners=None, workshop=None):
+        """Indexes (position, game) pairs; library_folders, genres, owners and workshop map app ids to extra data."""
+        library_folders, genres, workshop = library_folders or {}, genres or {}, workshop or {}
+        batch = defaultdict(int)  # Build the batch's bits first, then merge each facet once
+        for position, game in items:
+            owner_mask = owners.get(game[1], 0) if owners is not None else None
+            for facet in self.facets_for(game, library_folders.get(game[1]), genres.get(game[1], ()), owner_mask, workshop.get(game[1])):
+                batch[facet] |= 1 << position
+            self.size = max(self.size, position + 1)
+
+        for facet, bits in batch.items():
+            self.bitsets[facet] |= bits
+
+
+    def add_facet(self, position, facet):
+        """Sets one extra facet on a position, e.g. a genre learned after the game was indexed."""
+        self.bitsets[facet] |= 1 << position
+
+
+    def remove_facet(self, position, facet):
+        """Clears one facet from a position, e.g. a download state that has moved on."""
+        if facet in self.bitsets:
+            self.bitsets[facet] &= ~(1 << position)
+
+
+    def clear(self):
+        self.bitsets.clear()
+        self.size = 0
+
+
+    def facets_for(self, game, library=None, genres=(), owner_mask=None, workshop=None):
+        """Lists the facet values a game belongs to; owner facets need the game's owner mask.
+
+        workshop is the game's (installed items, bytes) pair, if it has workshop content.
+        """
+        _, _, last_played, _, size_on_disk, installed, playtime = game
+        last_played, size_on_disk, playtime = int(last_played or 0), int(size_on_disk or 0), int(playtime or 0)
+
+        facets = [f"playtime:{bucket(playtime, self.PLAYTIME_BUCKETS)}"]
+        if installed:
+            facets.append("is:installed")
+        if not playtime and not last_played:
+            facets.append("is:unplayed")
+        if size_on_disk:
+            facets.append(f"size:{bucket(size_on_disk, self.SIZE_BUCKETS)}")
+        if last_played:
+            facets.append(f"played:{bucket(time.time() - last_played, self.AGE_BUCKETS)}")
+        else:
+            facets.append("played:never")
+        if library:
+            facets.append(f"library:{normalize(library)}")
+        facets.extend(f"genre:{normalize(genre)}" for genre in genres)
+        if owner_mask is not None:
+            facets.extend(self.owner_facets(owner_mask))
+        if workshop:
+            facets.append(f"workshop:{bucket(workshop[1], self.SIZE_BUCKETS)}")  # "workshop:" alone matches any
+        return facets
+
+
+    def owner_facets(self, mask):
+        """owner:anyone, owner:everyone, owner:me, owner:only-me and owner:<account name>."""
+        if not mask or len(self.account_names) < 2:
+            return []  # Installed but in nobody's library, or there is only one account
+
+        everyone = (1 << len(self.account_names)) - 1
+        facets = ["owner:anyone"]
+        if mask & everyone == everyone:
+            facets.append("owner:everyone")
+        if mask & 1:
+            facets.append("owner:me")
+            if mask == 1:
+                facets.append("owner:only-me")
+        facets.extend(
+            "owner:" + "".join(normalize(name).split())  # No spaces, so it can be typed as one term
+            for bit, name in enumerate(self.account_names[1:], 1) if mask & (1 << bit)
+        )
+        return facets
+
+
+    def all(self):
+        return (1 << self.size) - 1
+
+
+    def get(self, facet):
+        return self.bitsets.get(facet, 0)
+
+
+    def matching(self, key, value_prefix):
+        """OR of every value of key that starts with value_prefix, so partially typed values work."""
+        prefix = f"{key}:{value_prefix}"
+        mask = 0
+        for facet, bits in self.bitsets.items():
+            if facet.startswith(prefix):
+                mask |= bits
+        return mask
+
+
+    def query(self, expression):
+        """Evaluates a facet string or a nested ("and" | "or" | "not", ...) tuple to a bitset."""
+        if isinstance(expression, str):
+            return self.get(expression)
+
+        operator, *operands = expression
+        if operator == "not":
+            return self.all() & ~self.query(operands[0])
+
+        results = [self.query(operand) for operand in operands]
+        mask = self.all() if operator == "and" else 0
+        for result in results:
+            mask = mask & result if operator == "and" else mask | result
+        return mask
+
+
+    def filter_text(self, text):
+        """Splits search text into plain words and a bitset for its facet terms.
+
+        Terms like "genre:indie" or "-is:installed" are facets; values of the same key are
+        OR'd, different keys are AND'd and a leading "-" negates a term. Returns
+        (remaining_text, bitset or None when the text has no facet terms).
+        """
+        words, included, excluded, saw_facet = [], defaultdict(int), 0, False
+        for word in text.split():
+            negated = word.startswith("-")
+            key, separator, value = word.lstrip("-").partition(":")
+            key = key.lower()
+            if not separator or key not in self.KEYS:
+                words.append(word)
+                continue
+
+            saw_facet = True
+            bits = self.matching(key, normalize(value))
+            if negated:
+                excluded |= bits
+            else:
+                included[key] |= bits
+
+        if not saw_facet:
+            return text, None
+
+        mask = self.all()
+        for bits in included.values():
+            mask &= bits
+        return " ".join(words), mask & ~excluded
+
+
+    def counts(self):
+        """Returns {facet: number of games} for building filter menus."""
+        return {facet: bin(bits).count("1") for facet, bits in self.bitsets.items()}
@@ -0,0 +1,38 @@
+class IncrementalFilter:
+    """Text filter that reuses the previous result when the query only gets narrower.
+
+    If the new query contains the previous one, every new match must already be a
+    previous match, so only those are re-checked. Items appended to the source since
+    the last call are checked on their own instead of rescanning everything.
+    """
+    def __init__(self, matches_query, search=None):
+        self.matches_query = matches_query  # (item, query) -> bool
+        self.search = search  # Optional query -> matching items, used instead of a full scan
+        self.reset()
+
+
+    def reset(self):
+        self.query = None
+        self.matches = []
+        self.checked = 0  # How many items of the source have been evaluated
+
+
+    def apply(self, query, items):
+        """Returns the items matching query, in the order they appear in items."""
+        narrowing = self.query is not None and self.query in query and self.checked <= len(items)
+        if not narrowing:
+            self.reset()
+            if self.search is not None:
+                self.query, self.matches, self.checked = query, self.search(query), len(items)
+                return list(self.matches)
+
+        candidates = self.matches
+        if query != self.query:
+            candidates = [item for item in candidates if self.matches_query(item, query)]
+
+        # Anything loaded since the last call hasn't been looked at yet
+        new_items = items[self.checked:]
+        candidates.extend(item for item in new_items if self.matches_query(item, query))
+
+        self.query, self.matches, self.checked = query, candidates, len(items)
+        return list(candidates)
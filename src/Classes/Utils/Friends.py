@@ -0,0 +1,140 @@
+import time
+import threading
+from array import array
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from Classes.Utils.Tracing import span
+
+
+
+def overlap(libraries, mode="all"):
+    """Combines app id arrays: "all" keeps the ids found in every array, "any" the ids in at least one.
+
+    None entries (private or unavailable libraries) are skipped.
+    """
+    arrays = sorted((appids for appids in libraries if appids is not None), key=len)
+    if not arrays:
+        return set()
+
+    if mode == "any":
+        return set().union(*arrays)
+
+    # Start from the smallest library so every later pass only shrinks an already small set
+    shared = set(arrays[0])
+    for appids in arrays[1:]:
+        shared.intersection_update(appids)
+        if not shared:
+            break
+    return shared
+
+
+
+class RateLimiter:
+    """Spaces out calls made from several threads to at most rate per second."""
+    def __init__(self, rate):
+        self.interval = 1 / rate
+        self.lock = threading.Lock()
+        self.next_slot = 0.0
+
+
+    def wait(self):
+        """Blocks until the caller's turn; turns are handed out in call order."""
+        with self.lock:
+            slot = max(time.monotonic(), self.next_slot)
+            self.next_slot = slot + self.interval
+        delay = slot - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+
+
+class FriendLibraries:
+    """The main account's friends and the app ids each of them owns.
+
+    Both are cached under cache_dir. Libraries are fetched a few at a time through one shared
+    rate limiter, so a long friend list doesn't run into the Web API's request limits.
+    """
+    FRIENDS_CACHE_SECONDS = 60 * 60
+    LIBRARY_CACHE_SECONDS = 6 * 60 * 60
+
+
+    def __init__(self, game_library, cache_dir, requests_per_second=4, workers=8):
+        self.game_library = game_library
+        self.cache_dir = Path(cache_dir)
+        self.limiter = RateLimiter(requests_per_second)
+        self.workers = workers
+
+
+    def get_friends(self, refresh=False):
+        """Returns the friend list as {"steam_id", "name"} dicts sorted by name."""
+        cache_file = self.cache_dir / "friends.json"
+        cached = self.game_library.read_owned_cache(cache_file)
+        if not refresh and cached and time.time() - cached["fetched"] < self.FRIENDS_CACHE_SECONDS:
+            return cached["data"]
+
+        try:
+            self.limiter.wait()
+            response = self.game_library.fetch_friend_list()
+            if "friendslist" not in response:
+                raise ValueError("friend list unavailable, it may be private")
+            steam_ids = [friend["steamid"] for friend in response["friendslist"].get("friends", [])]
+
+            # Summaries come 100 profiles per request
+            names = {}
+            for start in range(0, len(steam_ids), 100):
+                self.limiter.wait()
+                summaries = self.game_library.fetch_player_summaries(steam_ids[start:start + 100])
+                for player in summaries.get("response", {}).get("players", []):
+                    names[player["steamid"]] = player.get("personaname")
+        except Exception as e:
+            if cached:
+                print(f"Error fetching friend list, using cached list: {e}")
+                return cached["data"]
+            raise
+
+        friends = sorted(({"steam_id": steam_id, "name": names.get(steam_id) or steam_id} for steam_id in steam_ids), key=lambda friend: friend["name"].casefold())
+        try:
+            self.game_library.write_owned_cache(cache_file, friends)
+        except OSError as e:
+            print(f"Error caching friend list: {e}")
+        return friends
+
+
+    def fetch_libraries(self, friends, progress=None, is_cancelled=None):
+        """Returns steam_id -> sorted app id array for the given friends; None where a library is private.
+
+        progress is called with (done, total) as libraries come in; once is_cancelled returns
+        True the remaining friends are skipped.
+        """
+        libraries = {}
+        if not friends:
+            return libraries
+
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(friends)), thread_name_prefix="friends") as executor:
+            futures = [executor.submit(self.fetch_library, friend, is_cancelled) for friend in friends]
+            for done, future in enumerate(as_completed(futures), 1):
+                steam_id, appids = future.result()
+                libraries[steam_id] = appids
+                if progress:
+                    progress(done, len(friends))
+        return libraries
+
+
+    def fetch_library(self, friend, is_cancelled=None):
+        if is_cancelled and is_cancelled():
+            return friend["steam_id"], None
+
+        account = {"steam_id": friend["steam_id"], "api_key": self.game_library.api_key, "name": friend["name"]}
+        try:
+            with span("friend library", "network", steam_id=friend["steam_id"]):
+                data = self.game_library.fetch_account(1, account, self.cache_dir, self.LIBRARY_CACHE_SECONDS, self.limiter.wait)
+        except Exception as e:
+            # A timed out or failing profile counts as unavailable instead of failing everyone's overlap
+            print(f"Error fetching library of {friend['name']}: {e}")
+            return friend["steam_id"], None
+
+        # A private profile answers with an empty response rather than an error
+        games = data.get("response", {}).get("games")
+        if games is None:
+            return friend["steam_id"], None
+        return friend["steam_id"], array("I", sorted(game["appid"] for game in games))
@@ -0,0 +1,65 @@
+import heapq
+import threading
+
+
+
+class ImageJobScheduler:
+    """Hands out pending app ids to image workers, most important first.
+
+    Order: rows the user is looking at, then installed games, then recently played
+    games (newest first), then everything else in library order.
+    """
+    FOCUSED, INSTALLED, PLAYED, BACKGROUND = range(4)
+
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.games = {}  # app_id -> game tuple
+        self.pending = set()  # App ids that have not been handed out yet
+        self.focus = {}  # app_id -> position among the rows in view
+        self.order = {}  # app_id -> library position, the tie breaker within a tier
+        self.heap = []
+
+
+    def add_games(self, games):
+        """Queues every game in the list for image loading."""
+        with self.lock:
+            for game in games:
+                app_id = game[1]
+                self.games[app_id] = game
+                self.order.setdefault(app_id, len(self.order))
+                self.pending.add(app_id)
+                heapq.heappush(self.heap, (self._priority(app_id), self.order[app_id], app_id))
+
+
+    def prioritize(self, app_ids):
+        """Moves the given app ids, in order, ahead of everything else still pending."""
+        with self.lock:
+            self.focus = {app_id: rank for rank, app_id in enumerate(app_ids)}
+            self.heap = [(self._priority(app_id), self.order[app_id], app_id) for app_id in self.pending]
+            heapq.heapify(self.heap)
+
+
+    def next_job(self):
+        """Pops the most important pending app id, or None when nothing is left."""
+        with self.lock:
+            while self.heap:
+                _, _, app_id = heapq.heappop(self.heap)
+                if app_id in self.pending:
+                    self.pending.discard(app_id)
+                    return app_id
+        return None
+
+
+    def _priority(self, app_id):
+        """Builds the heap key for an app id; callers must hold the lock."""
+        if app_id in self.focus:
+            return (self.FOCUSED, self.focus[app_id])
+
+        game = self.games[app_id]
+        last_played = int(game[2] or 0)
+        if game[5]:
+            return (self.INSTALLED, -last_played)
+        if last_played:
+            return (self.PLAYED, -last_played)
+        return (self.BACKGROUND, 0)
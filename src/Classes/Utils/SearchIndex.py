@@ -0,0 +1,82 @@
+import unicodedata
+from collections import Counter, defaultdict
+
+
+
+def normalize(text):
+    """Casefolds and strips accents so that 'Élan', 'ELAN' and 'elan' compare equal."""
+    decomposed = unicodedata.normalize("NFKD", str(text))
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+
+def trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+
+class SearchIndex:
+    """Substring search over game names and app ids backed by a trigram index.
+
+    Games are identified by their position in the order they were added, which
+    matches the position in the main window's game list.
+    """
+    def __init__(self):
+        self.haystacks = []  # Normalized "name\0appid" per position
+        self.grams = defaultdict(set)  # trigram -> positions containing it
+
+
+    def __len__(self):
+        return len(self.haystacks)
+
+
+    def add(self, game):
+        """Indexes a game tuple and returns its position."""
+        position = len(self.haystacks)
+        haystack = f"{normalize(game[0])}\0{game[1]}"
+        self.haystacks.append(haystack)
+        for gram in trigrams(haystack):
+            self.grams[gram].add(position)
+        return position
+
+
+    def clear(self):
+        self.haystacks.clear()
+        self.grams.clear()
+
+
+    def matches(self, position, query):
+        """Checks one position against an already normalized query."""
+        return query in self.haystacks[position]
+
+
+    def lookup(self, query):
+        """Returns the sorted positions whose name or app id contains an already normalized query."""
+        if not query:
+            return list(range(len(self.haystacks)))
+
+        # Too short for trigrams; the names are already normalized so this is a plain scan
+        if len(query) < 3:
+            return [position for position, haystack in enumerate(self.haystacks) if query in haystack]
+
+        # Intersect the smallest posting lists first, then verify the survivors
+        postings = sorted((self.grams.get(gram, set()) for gram in trigrams(query)), key=len)
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            if not candidates:
+                break
+            candidates &= posting
+        return sorted(position for position in candidates if query in self.haystacks[position])
+
+
+    def fuzzy_search(self, query, limit=50, min_score=0.5):
+        """Typo tolerant lookup: positions ranked by the share of the query's trigrams they contain."""
+        grams = trigrams(normalize(query))
+        if not grams:
+            return []
+
+        scores = Counter()
+        for gram in grams:
+            scores.update(self.grams.get(gram, ()))
+
+        threshold = min_score * len(grams)
+        return [position for position, score in scores.most_common(limit) if score >= threshold]
@@ -0,0 +1,52 @@
+import zlib
+import marshal
+from Classes.Utils.Config import atomic_write
+
+
+
+SNAPSHOT_MAGIC = b"STSNAP1\n"  # Bump when the layout changes so old files are ignored
+
+
+def save_snapshot(snapshot_file, games, library_folders, install_filter, owner, owners=None, account_names=None, workshop=None):
+    """Writes the merged library to a compact binary file for the next launch to show immediately.
+
+    owner identifies the (steam_path, steam_id) the list belongs to, so a snapshot taken
+    for another account is never shown. owners maps app ids to the owner masks of a
+    multi-account library, workshop to (installed items, bytes) pairs. Covers aren't stored;
+    rows read them from the disk cache when painted.
+    """
+    payload = {
+        "owner": tuple(str(part) for part in owner),
+        "games": [tuple(game) for game in games],
+        "library_folders": {app_id: str(path) for app_id, path in library_folders.items()},
+        "install_filter": bool(install_filter),
+        "owners": dict(owners or {}),
+        "account_names": list(account_names or ["me"]),
+        "workshop": dict(workshop or {}),
+    }
+
+    with atomic_write(snapshot_file, 'wb') as file:
+        file.write(SNAPSHOT_MAGIC)
+        file.write(zlib.compress(marshal.dumps(payload), 1))  # Level 1 favours load speed over size
+
+
+def load_snapshot(snapshot_file, owner):
+    """Returns the saved snapshot dict, or None if it is missing, unreadable or for another owner."""
+    try:
+        with open(snapshot_file, 'rb') as file:
+            data = file.read()
+        if not data.startswith(SNAPSHOT_MAGIC):
+            return None
+        payload = marshal.loads(zlib.decompress(data[len(SNAPSHOT_MAGIC):]))
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        print(f"Error loading library snapshot {snapshot_file}: {e}")
+        return None
+
+    if payload.get("owner") != tuple(str(part) for part in owner):
+        return None
+    payload.setdefault("owners", {})  # Snapshots from before multi-account support
+    payload.setdefault("account_names", ["me"])
+    payload.setdefault("workshop", {})
+    return payload
@@ -0,0 +1,100 @@
+import bisect
+from Classes.Utils.SearchIndex import normalize
+
+
+
+class SortIndex:
+    """Keeps one presorted permutation of game positions per sort criterion.
+
+    Switching criteria or direction is a walk over an existing permutation, and a
+    filtered view is produced by walking it against per-position flags, so no
+    comparisons happen after a game has been inserted.
+    """
+    CRITERIA = {
+        "name": lambda game: (normalize(game[0]), game[0]),  # Accent and case insensitive, exact name breaks ties
+        "last_played": lambda game: int(game[2] or 0),
+        "last_updated": lambda game: int(game[3] or 0),
+        "size": lambda game: int(game[4] or 0),
+        "playtime": lambda game: int(game[6] or 0),
+    }
+    # Criteria whose keys are measured after loading; the fallback is used until set_values() supplies one
+    VALUE_CRITERIA = {
+        "disk_usage": lambda game: int(game[4] or 0),
+        "workshop_size": lambda game: 0,
+    }
+
+
+    def __init__(self):
+        self.values = {criterion: {} for criterion in self.VALUE_CRITERIA}  # criterion -> app_id -> key
+        self.key_funcs = dict(self.CRITERIA)
+        for criterion, fallback in self.VALUE_CRITERIA.items():
+            self.key_funcs[criterion] = lambda game, values=self.values[criterion], fallback=fallback: values[game[1]] if game[1] in values else fallback(game)
+        self.keys = {criterion: [] for criterion in self.key_funcs}  # Sorted (key, position) pairs
+        self.permutations = {criterion: [] for criterion in self.key_funcs}  # Positions in the same order
+
+
+    def __len__(self):
+        return len(self.permutations["name"])
+
+
+    def add(self, position, game):
+        """Inserts one game into every permutation."""
+        for criterion, key_func in self.key_funcs.items():
+            entry = (key_func(game), position)
+            index = bisect.bisect_right(self.keys[criterion], entry)
+            self.keys[criterion].insert(index, entry)
+            self.permutations[criterion].insert(index, position)
+
+
+    def add_many(self, items):
+        """Inserts (position, game) pairs; large batches are merged with one sort instead of many inserts."""
+        items = list(items)
+        if len(items) * 8 < len(self):
+            for position, game in items:
+                self.add(position, game)
+            return
+
+        for criterion, key_func in self.key_funcs.items():
+            keys = self.keys[criterion]
+            keys.extend((key_func(game), position) for position, game in items)
+            keys.sort()  # Timsort merges the already sorted run with the new one
+            self.permutations[criterion] = [position for _, position in keys]
+
+
+    def add_values(self, criterion, values):
+        """Supplies VALUE_CRITERIA keys for games that are about to be added."""
+        self.values[criterion].update(values)
+
+
+    def set_values(self, criterion, values, games):
+        """Replaces the keys of a VALUE_CRITERIA entry and re-sorts it; games are the tuples by position."""
+        self.values[criterion].clear()
+        self.values[criterion].update(values)
+        key_func = self.key_funcs[criterion]
+        self.keys[criterion] = sorted((key_func(game), position) for position, game in enumerate(games))
+        self.permutations[criterion] = [position for _, position in self.keys[criterion]]
+
+
+    def clear(self):
+        """Empties the permutations; values from set_values() are kept for the games indexed next."""
+        for criterion in self.key_funcs:
+            self.keys[criterion].clear()
+            self.permutations[criterion].clear()
+
+
+    def order(self, criterion, reverse=False, flags=None):
+        """Returns positions in sorted order, keeping only those whose flag is set when flags is given."""
+        permutation = self.permutations[criterion]
+        walk = reversed(permutation) if reverse else permutation
+        if flags is None:
+            return list(walk)
+        return [position for position in walk if flags[position]]
+
+
+    @staticmethod
+    def flags_for(positions, size):
+        """Builds a per-position flag array with the given positions set."""
+        flags = bytearray(size)
+        for position in positions:
+            flags[position] = 1
+        return flags
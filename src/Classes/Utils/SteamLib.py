@@ -1,10 +1,68 @@
 import os
 import re
 import json
+import time
 import random
-import requests
 from pathlib import Path
-
+from concurrent.futures import ThreadPoolExecutor
+from Classes.Utils.Tracing import traced
+from Classes.Utils.Config import atomic_write
+
+
+
+# AppState bits of a manifest's StateFlags
+STATE_UPDATE_REQUIRED = 2
+STATE_FULLY_INSTALLED = 4
+STATE_UPDATE_RUNNING = 256
+STATE_UPDATE_PAUSED = 512
+STATE_UPDATE_STARTED = 1024
+STATE_PREALLOCATING = 524288
+STATE_DOWNLOADING = 1048576
+STATE_STAGING = 2097152
+STATE_COMMITTING = 4194304
+LAST_UPDATED = re.compile(r'"lastupdated"\s+"(\d+)"', re.I)  # Spelled "LastUpdated" by some Steam versions
+STATE_FIELD = re.compile(r'"(StateFlags|BytesToDownload|BytesDownloaded|BytesToStage|BytesStaged|UpdateResult)"\s+"(\d+)"')
+
+
+def install_state(fields):
+    """Turns a manifest's StateFlags and byte counters into (state, progress, update result).
+
+    state is "installed", "update-required", "downloading", "paused", "staging", "staged" or
+    "incomplete"; progress is 0-1 for the states that move bytes and None otherwise.
+    """
+    flags = fields.get("StateFlags", 0)
+    to_download, downloaded = fields.get("BytesToDownload", 0), fields.get("BytesDownloaded", 0)
+    to_stage, staged = fields.get("BytesToStage", 0), fields.get("BytesStaged", 0)
+    download_progress = min(downloaded / to_download, 1.0) if to_download else None
+
+    if flags & (STATE_STAGING | STATE_COMMITTING):
+        state, progress = "staging", min(staged / to_stage, 1.0) if to_stage else None
+    elif flags & STATE_UPDATE_PAUSED:
+        state, progress = "paused", download_progress
+    elif flags & (STATE_DOWNLOADING | STATE_PREALLOCATING | STATE_UPDATE_STARTED | STATE_UPDATE_RUNNING):
+        state, progress = "downloading", download_progress
+    elif flags & STATE_UPDATE_REQUIRED:
+        # Everything downloaded and staged, waiting for Steam to apply it
+        if to_stage and staged >= to_stage:
+            state, progress = "staged", None
+        else:
+            state, progress = "update-required", download_progress
+    elif flags & STATE_FULLY_INSTALLED:
+        state, progress = "installed", None
+    else:
+        state, progress = "incomplete", None
+    return state, progress, fields.get("UpdateResult", 0)
+
+
+def read_install_state(acf_file):
+    """Re-reads only the install state of an appmanifest_<appid>.acf."""
+    fields = {}
+    with open(acf_file, 'r', encoding='utf-8') as file:
+        for line in file:
+            match = STATE_FIELD.search(line)
+            if match:
+                fields.setdefault(match.group(1), int(match.group(2)))
+    return install_state(fields)
 
 
 def is_valid_steam_id(steam_id):
@@ -17,12 +75,81 @@ def is_valid_api_key(api_key):
     return isinstance(api_key, str) and len(api_key) == 32 and all(c in '0123456789abcdefABCDEF' for c in api_key)
 
 
+def parse_workshop_manifest(manifest_file):
+    """Reads an appworkshop_<appid>.acf; returns (app id, installed item count, bytes on disk)."""
+    appid, size_on_disk, item_sizes, depth, section = None, None, [], 0, None
+    with open(manifest_file, 'r', encoding='utf-8') as file:
+        for line in file:
+            line = line.strip()
+            if line == "{":
+                depth += 1
+                continue
+            if line == "}":
+                depth -= 1
+                if depth <= 1:
+                    section = None
+                continue
+
+            match = re.match(r'"([^"]*)"(?:\s+"([^"]*)")?', line)
+            if not match:
+                continue
+            key, value = match.groups()
+            if depth == 1:
+                if value is None:
+                    section = key  # Its block opens on the next line
+                elif key == "appid":
+                    appid = value
+                elif key == "SizeOnDisk" and value.isdigit():
+                    size_on_disk = int(value)
+            elif section == "WorkshopItemsInstalled":
+                if depth == 2 and value is None:
+                    item_sizes.append(0)  # One block per installed item
+                elif depth == 3 and key == "size" and value and value.isdigit() and item_sizes:
+                    item_sizes[-1] = int(value)
+    return appid, len(item_sizes), size_on_disk if size_on_disk is not None else sum(item_sizes)
+
+
+def configured_accounts(config):
+    """Reads the extra Steam accounts whose libraries are merged with the main one.
+
+    Section 1's "accounts" lists config ids; each of those sections holds a "profile_id",
+    and optionally an "api_key" (defaults to the main key) and a display "name".
+    """
+    accounts = []
+    for account_id in config.get_value(1, "accounts") or []:
+        steam_id = config.get_value(account_id, "profile_id")
+        if not is_valid_steam_id(str(steam_id)):
+            print(f"Skipping account {account_id}: invalid profile_id {steam_id!r}")
+            continue
+        accounts.append({
+            "steam_id": str(steam_id),
+            "api_key": config.get_value(account_id, "api_key"),
+            "name": config.get_value(account_id, "name") or str(steam_id),
+        })
+    return accounts
+
+
 
 class GameLibrary:
-    def __init__(self, steam_path, api_key, steam_id):
+    OWNED_CACHE_SECONDS = 15 * 60  # Other accounts' libraries are refetched at most this often
+
+
+    def __init__(self, steam_path, api_key, steam_id, accounts=(), cache_dir=None):
         self.steam_path = Path(steam_path)
         self.api_key = api_key
         self.steam_id = steam_id
+        self.library_folders = {}  # app_id -> library folder the game is installed in
+        self.install_filter = False  # True once both installed and owned games were found
+        self.workshop = {}  # app_id -> (subscribed items installed, bytes) from appworkshop manifests
+        self.install_states = {}  # app_id -> install_state() of its manifest
+        self.manifests = {}  # app_id -> (manifest path, mtime_ns when it was read)
+
+        # Bit n of an owner mask is self.accounts[n]; the main account is bit 0
+        self.accounts = [{"steam_id": steam_id, "api_key": api_key, "name": "me"}]
+        self.accounts += [dict(account, api_key=account.get("api_key") or api_key) for account in accounts]
+        self.account_names = [account["name"] for account in self.accounts]
+        self.owners = {}  # app_id -> owner mask
+        self.cache_dir = cache_dir  # Where each account's last GetOwnedGames response is kept
 
 
     def load_excluded_apps(self, json_file):
@@ -36,6 +163,7 @@ class GameLibrary:
             return {}
 
 
+    @traced("get_library_paths", "steamlib")
     def get_library_paths(self):
         """Retrieve Steam library folders from libraryfolders.vdf."""
         library_file = self.steam_path / 'steamapps' / 'libraryfolders.vdf'
@@ -53,6 +181,7 @@ class GameLibrary:
             return []
 
 
+    @traced("get_installed_games", "steamlib")
     def get_installed_games(self, excluded_apps_file=None):
         games = []
         excluded_apps = {}
@@ -66,8 +195,10 @@ class GameLibrary:
 
             for acf_file in steamapps_path.glob('*.acf'):
                 try:
+                    mtime = acf_file.stat().st_mtime_ns
                     with acf_file.open('r', encoding='utf-8') as file:
                         appid, name, last_played, last_updated, size_on_disk = None, None, 0, 0, 0
+                        state_fields = {}
                         for line in file:
                             if '"appid"' in line:
                                 appid = re.search(r'"appid"\s+"(\d+)"', line).group(1)
@@ -75,10 +206,12 @@ class GameLibrary:
                                 name = line.split('"')[3]
                             elif '"LastPlayed"' in line:
                                 last_played = int(re.search(r'"LastPlayed"\s+"(\d+)"', line).group(1))
-                            elif '"lastupdated"' in line:
-                                last_updated = int(re.search(r'"lastupdated"\s+"(\d+)"', line).group(1))
+                            elif match := LAST_UPDATED.search(line):
+                                last_updated = int(match.group(1))
                             elif '"SizeOnDisk"' in line:
                                 size_on_disk = int(re.search(r'"SizeOnDisk"\s+"(\d+)"', line).group(1))
+                            elif match := STATE_FIELD.search(line):
+                                state_fields.setdefault(match.group(1), int(match.group(2)))
 
                         # Exclude SteamWorks Common Redistributables
                         if appid == "228980":
@@ -86,32 +219,46 @@ class GameLibrary:
 
                         if appid and name and appid not in excluded_apps and name not in excluded_apps.values():
                             games.append((name, appid, last_played, last_updated, size_on_disk, True))
+                            self.library_folders[appid] = library
+                            self.install_states[appid] = install_state(state_fields)
+                            self.manifests[appid] = (str(acf_file), mtime)
                 except Exception as e:
                     print(f"Error reading {acf_file}: {e}")
+
+            # Workshop manifests sit next to the app manifests, so read them in the same pass
+            for manifest_file in (steamapps_path / 'workshop').glob('appworkshop_*.acf'):
+                try:
+                    appid, items, total_size = parse_workshop_manifest(manifest_file)
+                    if appid and items:
+                        self.workshop[appid] = (items, total_size)
+                except Exception as e:
+                    print(f"Error reading {manifest_file}: {e}")
         return games
 
 
-    def get_owned_games(self, excluded_apps_file=None):
+    @traced("get_owned_games", "steamlib")
+    def get_owned_games(self, excluded_apps_file=None, is_cancelled=None):
         # Load excluded apps from the file if provided
         owned_games = []
         excluded_apps = {}
         if excluded_apps_file is not None:
             excluded_apps = self.load_excluded_apps(excluded_apps_file)
 
-        # Fetch owned games from the Steam API
-        url = "https://api.steampowered.com/IPlayerService/GetOwnedGames/v0001/"
-        params = {
-            "key": self.api_key,
-            "steamid": self.steam_id,
-            "include_appinfo": 1,
-            "format": "json"
-        }
-        response = requests.get(url, params=params)
-        data = response.json()
+        # A superseded load skips the network round trips entirely
+        if is_cancelled and is_cancelled():
+            return owned_games
+
+        # One entry per app; the main account's stats win, otherwise the first owner's
+        merged, owners = {}, {}
+        for bit, data in enumerate(self.fetch_all_accounts()):
+            for game in data.get("response", {}).get("games", []):
+                appid = str(game['appid'])
+                owners[appid] = owners.get(appid, 0) | (1 << bit)
+                merged.setdefault(appid, game)
+        self.owners = owners
         
         # Filter games based on the exclusion list
-        for game in data.get("response", {}).get("games", []):
-            appid = str(game['appid'])
+        for appid, game in merged.items():
             name = game.get("name", "Unknown")
             
             # Exclude the game if its appid or name is in the exclusion list
@@ -124,14 +271,117 @@ class GameLibrary:
         return owned_games
 
 
-    def get_all_games(self, excluded_apps_file=None):
+    def fetch_all_accounts(self):
+        """Fetches every account's owned games at once; returns the responses in account order."""
+        if len(self.accounts) == 1:
+            return [self.fetch_account(0, self.accounts[0])]
+
+        with ThreadPoolExecutor(max_workers=min(8, len(self.accounts))) as executor:
+            futures = [executor.submit(self.fetch_account, index, account) for index, account in enumerate(self.accounts)]
+            return [future.result() for future in futures]
+
+
+    def fetch_account(self, index, account, cache_dir=None, max_age=None, before_fetch=None):
+        """Returns one account's GetOwnedGames response, going through its cache file.
+
+        The main account is always refetched; others reuse a cached response younger than
+        max_age. A failed fetch falls back to whatever was cached, and only the main account's
+        failure raises. before_fetch is called right before a request actually goes out.
+        """
+        cache_dir = cache_dir or self.cache_dir
+        cache_file = Path(cache_dir) / f"owned_{account['steam_id']}.json" if cache_dir else None
+        cached = self.read_owned_cache(cache_file)
+        max_age = self.OWNED_CACHE_SECONDS if max_age is None else max_age
+        if index > 0 and cached and time.time() - cached["fetched"] < max_age:
+            return cached["data"]
+
+        try:
+            if before_fetch:
+                before_fetch()
+            data = self.fetch_owned_games(account["steam_id"], account["api_key"])
+            if "response" not in data:
+                raise ValueError("unexpected GetOwnedGames response")
+        except Exception as e:
+            if cached:
+                print(f"Error fetching games for {account['name']}, using cached list: {e}")
+                return cached["data"]
+            if index == 0:
+                raise
+            print(f"Error fetching games for {account['name']}: {e}")
+            return {}
+
+        if cache_file:
+            try:
+                self.write_owned_cache(cache_file, data)
+            except OSError as e:
+                print(f"Error caching games for {account['name']}: {e}")
+        return data
+
+
+    def read_owned_cache(self, cache_file):
+        if cache_file is None:
+            return None
+        try:
+            with open(cache_file, 'r') as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return None
+
+
+    def write_owned_cache(self, cache_file, data):
+        """Stores a response with the time it was fetched, replacing the file atomically."""
+        with atomic_write(cache_file) as file:
+            json.dump({"fetched": time.time(), "data": data}, file)
+
+
+    @traced("GetOwnedGames", "network")
+    def fetch_owned_games(self, steam_id=None, api_key=None):
+        """Fetch owned games from the Steam API and return the decoded response."""
+        url = "https://api.steampowered.com/IPlayerService/GetOwnedGames/v0001/"
+        params = {
+            "key": api_key or self.api_key,
+            "steamid": steam_id or self.steam_id,
+            "include_appinfo": 1,
+            "format": "json"
+        }
+        import requests  # Imported on first use; this runs on the loader thread, not during startup
+        response = requests.get(url, params=params, timeout=10)  # One stalled account would hold up the whole load
+        return response.json()
+
+
+    @traced("GetFriendList", "network")
+    def fetch_friend_list(self):
+        """Fetch the main account's friends from the Steam API and return the decoded response."""
+        url = "https://api.steampowered.com/ISteamUser/GetFriendList/v0001/"
+        params = {"key": self.api_key, "steamid": self.steam_id, "relationship": "friend", "format": "json"}
+        import requests
+        response = requests.get(url, params=params, timeout=10)
+        return response.json()
+
+
+    @traced("GetPlayerSummaries", "network")
+    def fetch_player_summaries(self, steam_ids):
+        """Fetch profile summaries for up to 100 Steam ids and return the decoded response."""
+        url = "https://api.steampowered.com/ISteamUser/GetPlayerSummaries/v0002/"
+        params = {"key": self.api_key, "steamids": ",".join(steam_ids), "format": "json"}
+        import requests
+        response = requests.get(url, params=params, timeout=10)
+        return response.json()
+
+
+    @traced("get_all_games", "steamlib")
+    def get_all_games(self, excluded_apps_file=None, is_cancelled=None):
+        """Merges installed and owned games; returns nothing once is_cancelled returns True."""
         # Attempt to fetch owned games
         try:
-            owned_games = self.get_owned_games(excluded_apps_file)
+            owned_games = self.get_owned_games(excluded_apps_file, is_cancelled)
         except Exception as e:
             self.install_filter = False
             owned_games = []  # If fetching fails, treat it as empty
 
+        if is_cancelled and is_cancelled():
+            return []
+
         # Retrieve installed games as you already do
         installed_games = self.get_installed_games(excluded_apps_file)
         installed_appids = {game[1] for game in installed_games}
@@ -201,13 +451,26 @@ class GameLibrary:
 
     def get_game_description(self, app_id):
         """Fetch the game description using requests and regex."""
+        return self.get_game_details(app_id)[0]
+
+
+    @traced("get_game_details", "network")
+    def get_game_details(self, app_id):
+        """Fetch the game description and genres from the store page.
+
+        Returns (description, genres, found); found is False when the text is a fallback message.
+        """
         url = f"https://store.steampowered.com/app/{app_id}"
         try:
+            import requests
             response = requests.get(url)
             if response.status_code == 200:
                 #match = re.search(r'<div class="game_description_snippet">(.*?)</div>', response.text, re.DOTALL)
                 match = re.search(r'<meta property="og:description" content="(.*?)"', response.text)
-                return match.group(1).strip() if match else "Description not available."
+                genres = re.findall(r'store\.steampowered\.com/genre/[^"]*"[^>]*>([^<]+)</a>', response.text)
+                if match:
+                    return match.group(1).strip(), list(dict.fromkeys(genres)), True
+                return "Description not available.", [], False
         except Exception as e:
             print(f"Error fetching description for app ID {app_id}: {e}")
-        return "Error fetching description."
\ No newline at end of file
+        return "Error fetching description.", [], False
\ No newline at end of file
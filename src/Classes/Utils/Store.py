@@ -0,0 +1,160 @@
+from Classes.Utils.Tracing import traced
+from Classes.Utils.Filter import IncrementalFilter
+from Classes.Utils.SearchIndex import SearchIndex, normalize
+from Classes.Utils.TextIndex import DescriptionIndex
+from Classes.Utils.SortIndex import SortIndex
+from Classes.Utils.Facets import FacetIndex, mask_to_flags, and_flags
+
+
+
+class GameStore:
+    """The game tuples and every index built over them, without any Qt.
+
+    Shared by the main window and the command line so both filter, sort and facet the
+    library the same way. A game's position is its index in games and in every index.
+    """
+    def __init__(self, description_file, fuzzy_search=False):
+        self.games = []  # Game tuples in insertion order
+        self.positions = {}  # app_id -> position in self.games
+        self.owners = {}  # app_id -> owner mask the facet index was built with
+        self.workshop = {}  # app_id -> (installed workshop items, bytes)
+        self.install_states = {}  # app_id -> (state, progress, update result) of installed games
+        self.search_index = SearchIndex()  # Positions in the index match positions in self.games
+        self.sort_index = SortIndex()  # Presorted positions for every sort option
+        self.facet_index = FacetIndex()  # Bitsets behind "is:installed", "genre:indie", ... search terms
+        self.description_index = DescriptionIndex(description_file)
+        self.text_filter = IncrementalFilter(self.search_index.matches, self.search_index.lookup)
+        self.fuzzy_search = fuzzy_search  # Typo tolerant fallback when nothing matches
+
+
+    def __len__(self):
+        return len(self.games)
+
+
+    @traced("index_games", "store")
+    def index_games(self, games, library_folders, owners=None, workshop=None):
+        """Appends games to the store and every index, returning the (position, game) pairs added."""
+        owners, workshop = owners or {}, workshop or {}
+        self.owners.update((game[1], owners[game[1]]) for game in games if game[1] in owners)
+        self.workshop.update((game[1], workshop[game[1]]) for game in games if game[1] in workshop)
+        self.sort_index.add_values("workshop_size", {app_id: size for app_id, (_, size) in workshop.items()})
+        added = []
+        for game in games:
+            game = tuple(game)
+            position = self.search_index.add(game)
+            self.positions[game[1]] = position
+            self.games.append(game)
+            added.append((position, game))
+
+        self.sort_index.add_many(added)
+
+        genres = {game[1]: self.description_index.get(game[1])[1] for _, game in added if game[1] in self.description_index}
+        self.facet_index.add_many(added, library_folders, genres, owners, workshop)
+        return added
+
+
+    def clear(self):
+        """Empties the game store and every index built over it."""
+        self.games.clear()
+        self.search_index.clear()
+        self.positions.clear()
+        self.owners.clear()
+        self.workshop.clear()
+        self.install_states.clear()
+        self.sort_index.clear()
+        self.facet_index.clear()
+        self.text_filter.reset()
+
+
+    def apply_install_states(self, states):
+        """Records install states (None once a manifest is gone) and moves games between state: facets."""
+        for app_id, state in states.items():
+            old = self.install_states.pop(app_id, None)
+            position = self.positions.get(app_id)
+            if old and position is not None:
+                self.facet_index.remove_facet(position, f"state:{old[0]}")
+            if state is None:
+                continue
+            self.install_states[app_id] = state
+            if position is not None:
+                self.facet_index.add_facet(position, f"state:{state[0]}")
+
+
+    def set_disk_usage(self, usage):
+        """Sorts "disk_usage" by install size plus the app_id -> {kind: bytes} measured outside it."""
+        totals = {app_id: int(self.games[self.positions[app_id]][4] or 0) + sum(kinds.values())
+                  for app_id, kinds in usage.items() if app_id in self.positions}
+        self.sort_index.set_values("disk_usage", totals, self.games)
+
+
+    def add_description(self, app_id, description, genres):
+        """Keeps a store description so it can be searched, and files the game under its genres."""
+        self.description_index.add(app_id, description, genres)
+        if app_id in self.positions:
+            for genre in genres:
+                self.facet_index.add_facet(self.positions[app_id], f"genre:{normalize(genre)}")
+
+
+    def query(self, text="", filters=(), sort="name", reverse=False, installed_only=False, app_ids=None, fuzzy=False):
+        """Returns the games matching text and every filter, in sort order.
+
+        text takes the words and facet terms of the search box. Each entry of filters is
+        parsed the same way and AND'd with the rest, so "is:installed" and "is:unplayed"
+        can be required together even though they share a key. app_ids, when given, limits
+        the result to those games (e.g. the ones shared with friends).
+
+        When no name matches, description matches or the fuzzy fallback are returned
+        instead, best match first.
+        """
+        size = len(self.games)
+        text, mask = self.facet_index.filter_text(text)
+        for facet_text in filters:
+            remaining, facet_mask = self.facet_index.filter_text(facet_text)
+            if remaining:
+                text = f"{text} {remaining}".strip()
+            if facet_mask is not None:
+                mask = facet_mask if mask is None else mask & facet_mask
+
+        search_text = normalize(text)
+        positions = self.text_filter.apply(search_text, range(size))
+        ranked = None  # Scored positions, best first, when no name matched
+
+        # Games whose cached description or genres match are shown alongside name matches
+        if len(search_text) >= 3:
+            described = [self.positions[app_id] for app_id in self.description_index.search(search_text) if app_id in self.positions]
+            if described and positions:
+                positions = sorted(set(positions).union(described))
+            elif described:
+                ranked = described
+
+        if not positions and not ranked and (fuzzy or self.fuzzy_search):
+            ranked = self.search_index.fuzzy_search(search_text)
+        if ranked:
+            positions = ranked
+
+        if installed_only:
+            mask = self.facet_index.get("is:installed") & (self.facet_index.all() if mask is None else mask)
+
+        flags = SortIndex.flags_for(positions, size)
+        if mask is not None:
+            flags = and_flags(flags, mask_to_flags(mask, size))
+        if app_ids is not None:
+            flags = and_flags(flags, SortIndex.flags_for([self.positions[app_id] for app_id in app_ids if app_id in self.positions], size))
+
+        if ranked:
+            # Every result comes from a scored match, so the best match leads instead of the sort
+            return [self.games[position] for position in ranked if flags[position]]
+
+        # Walk the presorted permutation, keeping the filtered positions
+        return list(map(self.games.__getitem__, self.sort_index.order(sort, reverse, flags)))
+
+
+    def find(self, name_or_appid):
+        """Resolves an app id or a name to games; an exact name match wins over partial ones."""
+        if name_or_appid in self.positions:
+            return [self.games[self.positions[name_or_appid]]]
+
+        wanted = normalize(name_or_appid)
+        matches = [self.games[position] for position in sorted(self.search_index.lookup(wanted))]
+        exact = [game for game in matches if normalize(game[0]) == wanted]
+        return exact or matches
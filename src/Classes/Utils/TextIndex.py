@@ -0,0 +1,162 @@
+import os
+import re
+import json
+import math
+import html
+import bisect
+from collections import Counter, defaultdict
+from Classes.Utils.SearchIndex import normalize
+from Classes.Utils.Config import atomic_write
+
+
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "into", "is", "it",
+    "its", "of", "on", "or", "that", "the", "this", "to", "with", "you", "your",
+}
+
+
+def stem(word):
+    """Very light suffix stripping so 'puzzles' and 'puzzle' land on the same term."""
+    if len(word) <= 4:
+        return word
+    if word.endswith("ies"):
+        return word[:-3] + "y"  # Strategies -> strategy
+    if word.endswith(("sses", "xes", "zes", "ches", "shes")):
+        return word[:-2]  # Classes -> class
+    if word.endswith("ings"):
+        word = word[:-1]
+    if word.endswith("ing") and len(word) > 6:
+        return word[:-3]  # Crafting -> craft
+    if word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        return word[:-1]  # Puzzles -> puzzle
+    return word
+
+
+def tokenize(text):
+    """Splits text into normalized, stemmed terms without stopwords."""
+    words = re.findall(r"[a-z0-9]+", normalize(html.unescape(text)))
+    return [stem(word) for word in words if word not in STOPWORDS]
+
+
+
+class DescriptionIndex:
+    """BM25 ranked full-text index over cached store descriptions and genres.
+
+    Documents are persisted as JSON with their term counts, so loading only
+    rebuilds the posting lists and never re-tokenizes.
+    """
+    K1, B = 1.2, 0.75
+
+
+    def __init__(self, index_file):
+        self.index_file = index_file
+        self.docs = {}  # app_id -> {"text", "genres", "terms": {term: count}, "length"}
+        self.postings = defaultdict(dict)  # term -> {app_id: count}
+        self.vocabulary = []  # Sorted terms, for prefix expansion while typing
+        self.total_length = 0
+        self._load()
+
+
+    def __contains__(self, app_id):
+        return str(app_id) in self.docs
+
+
+    def get(self, app_id):
+        """Returns the cached (description, genres) for an app id, or None."""
+        doc = self.docs.get(str(app_id))
+        return (doc["text"], doc["genres"]) if doc else None
+
+
+    def add(self, app_id, text, genres=(), save=True):
+        """Indexes (or re-indexes) one game's description and genres."""
+        app_id = str(app_id)
+        if app_id in self.docs:
+            self._remove(app_id)
+
+        genres = list(genres)
+        terms = Counter(tokenize(text))
+        for genre in genres:
+            terms.update(tokenize(genre))
+
+        doc = {"text": text, "genres": genres, "terms": dict(terms), "length": sum(terms.values())}
+        self._insert(app_id, doc)
+        if save:
+            self.save()
+
+
+    def search(self, query, limit=None):
+        """Returns app ids ranked by BM25; the last query word also matches as a prefix."""
+        words = tokenize(query)
+        if not words or not self.docs:
+            return []
+
+        # The word being typed is expanded to every term it starts
+        last_word = re.findall(r"[a-z0-9]+", normalize(html.unescape(query)))[-1]
+        terms = set(words[:-1]) | (self._prefix_terms(last_word) or {words[-1]})
+
+        scores = Counter()
+        avg_length = self.total_length / len(self.docs)
+        for term in terms:
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (len(self.docs) - len(postings) + 0.5) / (len(postings) + 0.5))
+            for app_id, count in postings.items():
+                length_norm = 1 - self.B + self.B * self.docs[app_id]["length"] / avg_length
+                scores[app_id] += idf * count * (self.K1 + 1) / (count + self.K1 * length_norm)
+
+        return [app_id for app_id, _ in scores.most_common(limit)]
+
+
+    def save(self):
+        """Writes the documents to disk through a temporary file so a crash can't truncate them."""
+        with atomic_write(self.index_file, 'w', encoding='utf-8') as file:
+            json.dump({"version": 1, "docs": self.docs}, file)
+
+
+    def _load(self):
+        if not os.path.exists(self.index_file):
+            return
+        try:
+            with open(self.index_file, encoding='utf-8') as file:
+                data = json.load(file)
+        except Exception as e:
+            print(f"Error loading search index {self.index_file}: {e}")
+            return
+
+        for app_id, doc in data.get("docs", {}).items():
+            self._insert(app_id, doc, sort_vocabulary=False)
+        self.vocabulary = sorted(self.postings)
+
+
+    def _insert(self, app_id, doc, sort_vocabulary=True):
+        self.docs[app_id] = doc
+        self.total_length += doc["length"]
+        for term, count in doc["terms"].items():
+            if sort_vocabulary and term not in self.postings:
+                bisect.insort(self.vocabulary, term)
+            self.postings[term][app_id] = count
+
+
+    def _remove(self, app_id):
+        doc = self.docs.pop(app_id)
+        self.total_length -= doc["length"]
+        for term in doc["terms"]:
+            postings = self.postings[term]
+            postings.pop(app_id, None)
+            if not postings:
+                del self.postings[term]
+                self.vocabulary.pop(bisect.bisect_left(self.vocabulary, term))
+
+
+    def _prefix_terms(self, prefix, limit=50):
+        """Returns up to limit indexed terms starting with prefix (stemmed or not)."""
+        terms = set()
+        for candidate in (prefix, stem(prefix)):
+            start = bisect.bisect_left(self.vocabulary, candidate)
+            for term in self.vocabulary[start:start + limit]:
+                if not term.startswith(candidate):
+                    break
+                terms.add(term)
+        return terms
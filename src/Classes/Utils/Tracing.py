@@ -0,0 +1,167 @@
+import os
+import json
+import time
+import atexit
+import threading
+from functools import wraps
+from Classes.Utils.Config import atomic_write
+
+
+TRACE_ENV = "STEAM_TRACE_FILE"  # Set to a file path to record a trace without touching the config
+
+
+
+class NoSpan:
+    """Stand-in returned while tracing is off; entering and leaving it does nothing."""
+    __slots__ = ()
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+    def set(self, **args):
+        pass
+
+
+_DISABLED = NoSpan()  # Shared, so a disabled span allocates nothing
+
+
+
+class Span:
+    """Records one complete ("X") event covering the with block."""
+    __slots__ = ("tracer", "name", "category", "args", "start")
+
+
+    def __init__(self, tracer, name, category, args):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+
+    def __exit__(self, *exc_info):
+        self.tracer.record(self.name, self.category, self.start, time.perf_counter_ns() - self.start, self.args)
+        return False
+
+
+    def set(self, **args):
+        """Adds arguments learned inside the span, e.g. whether a cache lookup hit."""
+        self.args.update(args)
+
+
+
+class Tracer:
+    """Collects spans from any thread and writes them as Chrome trace JSON (chrome://tracing, Perfetto).
+
+    Disabled, span() returns a shared no-op span, so instrumented code only
+    pays for one attribute check per call.
+    """
+    def __init__(self):
+        self.enabled = False
+        self.trace_file = None
+        self.events = []  # list.append is atomic, so pool threads can record without a lock
+        self.thread_names = {}  # thread id -> name, for the trace's metadata events
+        self.origin = time.perf_counter_ns()
+        self.registered = False
+
+
+    def enable(self, trace_file):
+        """Starts recording; the trace is written to trace_file by save() or at exit."""
+        self.trace_file = trace_file
+        self.enabled = True
+        if not self.registered:
+            atexit.register(self.save)
+            self.registered = True
+
+
+    def disable(self):
+        self.enabled = False
+
+
+    def span(self, name, category="app", **args):
+        if not self.enabled:
+            return _DISABLED
+        return Span(self, name, category, args)
+
+
+    def instant(self, name, category="app", **args):
+        """Records a point in time, e.g. a signal being emitted."""
+        if self.enabled:
+            self.events.append({
+                "name": name, "cat": category, "ph": "i", "s": "t", "ts": (time.perf_counter_ns() - self.origin) / 1000,
+                "pid": os.getpid(), "tid": self._thread_id(), "args": args,
+            })
+
+
+    def record(self, name, category, start_ns, duration_ns, args):
+        self.events.append({
+            "name": name, "cat": category, "ph": "X", "ts": (start_ns - self.origin) / 1000, "dur": duration_ns / 1000,
+            "pid": os.getpid(), "tid": self._thread_id(), "args": args,
+        })
+
+
+    def save(self):
+        """Writes everything recorded so far to the trace file."""
+        if not self.trace_file or not self.events:
+            return
+
+        pid = os.getpid()
+        metadata = [
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}}
+            for tid, name in list(self.thread_names.items())
+        ]
+        try:
+            with atomic_write(self.trace_file) as file:
+                json.dump({"traceEvents": metadata + list(self.events), "displayTimeUnit": "ms"}, file)
+        except Exception as e:
+            print(f"Error writing trace to {self.trace_file}: {e}")
+
+
+    def _thread_id(self):
+        tid = threading.get_ident()
+        if tid not in self.thread_names:
+            self.thread_names[tid] = threading.current_thread().name
+        return tid
+
+
+tracer = Tracer()
+
+
+def configure(trace_file=None):
+    """Enables tracing if the environment variable or the given config value names a file."""
+    trace_file = os.environ.get(TRACE_ENV) or trace_file
+    if trace_file:
+        tracer.enable(str(trace_file))
+
+
+def span(name, category="app", **args):
+    return tracer.span(name, category, **args)
+
+
+def instant(name, category="app", **args):
+    tracer.instant(name, category, **args)
+
+
+def traced(name=None, category="app"):
+    """Decorator form of span(), named after the function unless name is given."""
+    def decorator(func):
+        span_name = name or func.__qualname__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not tracer.enabled:
+                return func(*args, **kwargs)
+            with tracer.span(span_name, category):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
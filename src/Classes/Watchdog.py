@@ -0,0 +1,94 @@
+import sys
+import time
+import threading
+import traceback
+from datetime import datetime
+from PyQt5.QtCore import QObject, QTimer
+
+
+
+class StallWatchdog(QObject):
+    """Reports whenever the GUI event loop stops ticking for longer than a threshold.
+
+    A timer on the GUI thread records a heartbeat; a daemon thread checks its age and,
+    once it is too old, samples the GUI thread's Python stack. When the loop comes back
+    the stall is logged with its duration and the distinct stacks seen while it lasted.
+    """
+    MAX_SAMPLES = 5  # Distinct stacks kept per stall
+
+
+    def __init__(self, log_file, threshold_ms=500, parent=None):
+        super().__init__(parent)
+        self.log_file = log_file
+        self.threshold = threshold_ms / 1000
+        self.gui_thread = threading.get_ident()  # Created on the GUI thread
+        self.last_tick = time.monotonic()
+        self.stall_started = None  # Heartbeat time of the stall being sampled
+        self.samples = []
+        self.lock = threading.Lock()  # Guards stall_started and samples between the two threads
+        self.stop_event = threading.Event()
+        self.thread = None
+
+        self.heartbeat = QTimer(self)
+        self.heartbeat.setInterval(max(10, int(threshold_ms / 5)))
+        self.heartbeat.timeout.connect(self.tick)
+
+
+    def start(self):
+        """Starts watching; call once the event loop is running so startup isn't counted."""
+        self.last_tick = time.monotonic()
+        self.heartbeat.start()
+        self.thread = threading.Thread(target=self.watch, name="stall watchdog", daemon=True)
+        self.thread.start()
+
+
+    def stop(self):
+        self.heartbeat.stop()
+        self.stop_event.set()
+        self.tick()  # Log a stall that was still in progress
+
+
+    def tick(self):
+        """Heartbeat on the GUI thread; also closes off a stall that just ended."""
+        now = time.monotonic()
+        with self.lock:
+            started, samples = self.stall_started, self.samples
+            self.stall_started, self.samples = None, []
+            self.last_tick = now
+        if started is not None:
+            self.report(now - started, samples)
+
+
+    def watch(self):
+        """Watchdog thread: samples the GUI thread's stack while the heartbeat is overdue."""
+        poll, next_sample = self.threshold / 4, 0
+        while not self.stop_event.wait(poll):
+            with self.lock:
+                if time.monotonic() - self.last_tick < self.threshold:
+                    continue
+
+                if self.stall_started is None:
+                    self.stall_started, next_sample = self.last_tick, 0
+                if len(self.samples) < self.MAX_SAMPLES and time.monotonic() >= next_sample:
+                    stack = self.capture_stack()
+                    if stack and stack not in self.samples:
+                        self.samples.append(stack)
+                    next_sample = time.monotonic() + self.threshold
+
+
+    def capture_stack(self):
+        frame = sys._current_frames().get(self.gui_thread)
+        return "".join(traceback.format_stack(frame)) if frame is not None else None
+
+
+    def report(self, duration, samples):
+        """Prints a one line summary and appends the stacks to the log file."""
+        print(f"GUI stalled for {duration:.2f}s, see {self.log_file}")
+        try:
+            with open(self.log_file, 'a', encoding='utf-8') as file:
+                file.write(f"{datetime.now().isoformat(timespec='seconds')} GUI stalled for {duration:.3f}s\n")
+                for index, stack in enumerate(samples, 1):
+                    file.write(f"--- stack {index} of {len(samples)}\n{stack}")
+                file.write("\n")
+        except Exception as e:
+            print(f"Error writing stall log {self.log_file}: {e}")
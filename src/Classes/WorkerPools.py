@@ -0,0 +1,81 @@
+import os
+import threading
+from PyQt5.QtCore import QThreadPool, QRunnable
+
+
+
+class PoolTask(QRunnable):
+    """Runs a plain callable on a pool and reports when it leaves the queue."""
+    def __init__(self, func, on_start, pool_name):
+        super().__init__()
+        self.func = func
+        self.on_start = on_start
+        self.pool_name = pool_name
+
+
+    def run(self):
+        # Qt pool threads show up as "Dummy-N" to Python; name them after their pool for traces
+        thread = threading.current_thread()
+        if thread.name.startswith("Dummy"):
+            thread.name = f"{self.pool_name} pool"
+        self.on_start()
+        self.func()
+
+
+
+class WorkerPools:
+    """Named thread pools so network, disk and decoding work don't starve each other."""
+    DEFAULT_SIZES = {
+        "network": 16,  # Downloads spend their time waiting on sockets, not the CPU
+        "disk": 4,
+        "decode": os.cpu_count() or 4,
+    }
+
+
+    def __init__(self, config):
+        self.lock = threading.Lock()
+        self.pools, self.queued = {}, {}
+
+        for name, default_size in self.DEFAULT_SIZES.items():
+            key = f"{name}_pool_size"
+            size = config.get_value(1, key)
+            if not size:
+                # Write the default back so the size can be tuned from config.json
+                size = default_size
+                config.add_entry(1, key, size, "int")
+
+            pool = QThreadPool()
+            pool.setMaxThreadCount(max(1, int(size)))
+            self.pools[name] = pool
+            self.queued[name] = 0
+
+
+    def start(self, name, func, priority=0):
+        """Queues a callable on the named pool."""
+        with self.lock:
+            self.queued[name] += 1
+        self.pools[name].start(PoolTask(func, lambda: self._dequeued(name), name), priority)
+
+
+    def size(self, name):
+        return self.pools[name].maxThreadCount()
+
+
+    def stats(self):
+        """Returns {name: {"size", "active", "queued"}} for every pool."""
+        with self.lock:
+            queued = dict(self.queued)
+        return {
+            name: {"size": pool.maxThreadCount(), "active": pool.activeThreadCount(), "queued": queued[name]}
+            for name, pool in self.pools.items()
+        }
+
+
+    def wait_for_done(self, msecs=-1):
+        """Blocks until every pool is idle; used on shutdown."""
+        return all(pool.waitForDone(msecs) for pool in self.pools.values())
+
+
+    def _dequeued(self, name):
+        with self.lock:
+            self.queued[name] -= 1
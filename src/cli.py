@@ -0,0 +1,7 @@
+import sys
+from pathlib import Path
+from Classes.CLI import main
+
+if __name__ == "__main__":
+    app_root = Path(__file__).resolve().parent
+    sys.exit(main(app_root))
@@ -1,16 +1,55 @@
 import sys
+import argparse
 from pathlib import Path
-from PyQt5.QtWidgets import QApplication
-from Classes.Main import MainWindow
 
 if __name__ == "__main__":
-    app = QApplication(sys.argv)
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--profile-startup", action="store_true", help="print import times and time to first paint")
+    parser.add_argument("--search", help="filter the list by this text")
+    parser.add_argument("--random", action="store_true", help="pick a random game from the (filtered) list")
+    parser.add_argument("--show", metavar="APPID", help="open the info window for this app id")
+    parser.add_argument("--new-instance", action="store_true", help="start a new window even if one is already open")
+    args, qt_args = parser.parse_known_args()
+
+    profiler = None
+    if args.profile_startup:
+        from Classes.StartupProfile import StartupProfiler
+        profiler = StartupProfiler()
+        profiler.track_imports()
+
+    # Imported here so --profile-startup can time them
+    from PyQt5.QtWidgets import QApplication
+    from Classes.SingleInstance import SingleInstance
+
+    app = QApplication([sys.argv[0]] + qt_args)
+    if profiler:
+        profiler.mark("QApplication created")
 
     app_root = Path(__file__).resolve().parent
+    request = {key: value for key, value in (("search", args.search), ("random", args.random), ("show", args.show)) if value}
+
+    # Hand the request to the window that's already open instead of loading everything twice
+    instance = SingleInstance(app_root)
+    if not args.new_instance and instance.start(request):
+        sys.exit(0)
+
+    from Classes.Main import MainWindow
+
+    if profiler:
+        profiler.mark("imports")
+        profiler.watch_first_paint(app)
+
     window = MainWindow(app_root)
+    instance.message_received.connect(window.handle_instance_message)
+    if profiler:
+        profiler.mark("main window constructed")
     window.show()
+    if profiler:
+        profiler.mark("main window shown")
+    if request:
+        window.handle_instance_message(request)
 
     try:
         sys.exit(app.exec_())
     finally:
-        print("Exited")
\ No newline at end of file
+        print("Exited")
@@ -0,0 +1,45 @@
+import os
+import shutil
+import tempfile
+import unittest
+from Classes.Utils.Config import JSONConfig
+
+
+
+class FlushTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.config_file = os.path.join(self.directory, "config.json")
+        self.config = JSONConfig(self.config_file)
+        self.config.add_entry(1, "steam_path", "/steam", "str")
+        self.config.add_entry(1, "api_key", "key", "str")
+
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+
+    def assert_kept(self):
+        self.config.add_entry(1, "last_used_filter", "Last Played", "str")
+        reloaded = JSONConfig(self.config_file)
+        for config in (self.config, reloaded):
+            self.assertEqual(config.get_value(1, "steam_path"), "/steam")
+            self.assertEqual(config.get_value(1, "api_key"), "key")
+            self.assertEqual(config.get_value(1, "last_used_filter"), "Last Played")
+
+
+    def test_missing_file_keeps_every_setting(self):
+        os.remove(self.config_file)
+        self.assert_kept()
+
+
+    def test_corrupt_file_keeps_every_setting(self):
+        with open(self.config_file, "w") as file:
+            file.write('{"1": {"steam_pa')
+        self.assert_kept()
+
+
+    def test_other_instances_edits_are_kept(self):
+        JSONConfig(self.config_file).add_entry(1, "profile_id", "123", "str")
+        self.assert_kept()
+        self.assertEqual(JSONConfig(self.config_file).get_value(1, "profile_id"), "123")
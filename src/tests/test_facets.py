@@ -0,0 +1,73 @@
+import unittest
+from Classes.Utils.Facets import FacetIndex, mask_to_flags, and_flags
+
+
+
+def game(app_id, installed=True, playtime=0):
+    return (f"Game {app_id}", str(app_id), 0, 0, 0, installed, playtime)
+
+
+
+class MaskToFlagsTest(unittest.TestCase):
+    def test_expands_bits_least_significant_first(self):
+        self.assertEqual(mask_to_flags(0b1101, 4), bytearray([1, 0, 1, 1]))
+
+
+    def test_pads_and_truncates_to_size(self):
+        self.assertEqual(mask_to_flags(0b1, 3), bytearray([1, 0, 0]))
+        self.assertEqual(mask_to_flags(0b11111, 2), bytearray([1, 1]))
+        self.assertEqual(mask_to_flags(0, 0), bytearray())
+
+
+
+class AndFlagsTest(unittest.TestCase):
+    def test_bytewise_and(self):
+        self.assertEqual(and_flags(bytearray([1, 1, 0, 1]), bytearray([1, 0, 0, 1])), bytearray([1, 0, 0, 1]))
+
+
+    def test_keeps_length_when_high_positions_are_clear(self):
+        self.assertEqual(and_flags(bytearray([1, 0, 0]), bytearray([1, 1, 0])), bytearray([1, 0, 0]))
+
+
+
+class FilterTextTest(unittest.TestCase):
+    def setUp(self):
+        self.index = FacetIndex()
+        self.index.add_many(enumerate([game(1), game(2, installed=False), game(3, playtime=30)]))
+        self.index.add_facet(0, "genre:indie")
+        self.index.add_facet(2, "genre:rpg")
+
+
+    def test_plain_text_has_no_mask(self):
+        self.assertEqual(self.index.filter_text("portal 2"), ("portal 2", None))
+
+
+    def test_unknown_keys_stay_text(self):
+        self.assertEqual(self.index.filter_text("half-life: alyx"), ("half-life: alyx", None))
+
+
+    def test_same_key_is_ored_and_different_keys_anded(self):
+        self.assertEqual(self.index.filter_text("genre:indie genre:rpg"), ("", 0b101))
+        self.assertEqual(self.index.filter_text("genre:indie genre:rpg is:installed"), ("", 0b101))
+        self.assertEqual(self.index.filter_text("genre:rpg playtime:none"), ("", 0))
+
+
+    def test_negated_term(self):
+        self.assertEqual(self.index.filter_text("-genre:indie"), ("", 0b110))
+
+
+    def test_negated_term_matching_nothing_keeps_every_game(self):
+        self.assertEqual(self.index.filter_text("-genre:strategy"), ("", 0b111))
+        self.assertEqual(FacetIndex().filter_text("-genre:indie"), ("", 0))
+
+
+    def test_term_matching_nothing_matches_no_games(self):
+        self.assertEqual(self.index.filter_text("genre:strategy"), ("", 0))
+
+
+    def test_words_are_kept_beside_terms(self):
+        self.assertEqual(self.index.filter_text("game is:installed"), ("game", 0b101))
+
+
+    def test_partial_values_match_by_prefix(self):
+        self.assertEqual(self.index.filter_text("genre:in"), ("", 0b001))
@@ -0,0 +1,53 @@
+import os
+import shutil
+import tempfile
+import unittest
+from Classes.Utils.Store import GameStore
+
+
+
+def game(app_id, name, installed=True, playtime=0):
+    return (name, str(app_id), 0, 0, 0, installed, playtime)
+
+
+
+class QueryTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.store = GameStore(os.path.join(self.directory, "description_index.json"))
+        self.store.index_games([
+            game(1, "Portal", playtime=5),
+            game(2, "Portal 2", installed=False, playtime=50),
+            game(3, "Stardew Valley", playtime=500),
+            game(4, "Space Farmer"),
+        ], {})
+
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+
+    def names(self, games):
+        return [game[0] for game in games]
+
+
+    def test_name_matches_follow_the_sort(self):
+        self.assertEqual(self.names(self.store.query("portal", sort="playtime", reverse=True)), ["Portal 2", "Portal"])
+
+
+    def test_installed_only_and_app_ids(self):
+        self.assertEqual(self.names(self.store.query("portal", installed_only=True)), ["Portal"])
+        self.assertEqual(self.names(self.store.query(app_ids={"3", "4", "99"})), ["Space Farmer", "Stardew Valley"])
+
+
+    def test_fuzzy_results_are_in_score_order(self):
+        self.assertEqual(self.store.query("stardw valey"), [])
+        results = self.names(self.store.query("stardw valey", sort="playtime", fuzzy=True))
+        self.assertEqual(results[0], "Stardew Valley")
+
+
+    def test_description_only_matches_are_in_score_order(self):
+        self.store.description_index.add("4", "Grow crops in space.", save=False)
+        self.store.description_index.add("3", "Crops, crops and more crops.", save=False)
+        self.assertEqual(self.names(self.store.query("crops")), ["Stardew Valley", "Space Farmer"])
+        self.assertEqual(self.names(self.store.query("crops", app_ids={"4"})), ["Space Farmer"])